@@ -1,14 +1,14 @@
 /**
  * Service Worker for Gmail Organizer PWA.
  * Provides offline caching and background sync support.
+ *
+ * Template: service-worker.js is rendered from this file by
+ * gmail_organizer.mobile.write_asset_manifest(). The cache name is pinned
+ * to the asset hash so every deploy with changed assets evicts old caches.
  */
 
-const CACHE_NAME = 'gmail-organizer-v1';
-const STATIC_ASSETS = [
-  '/',
-  '/app/static/manifest.json',
-  '/app/static/mobile.css',
-];
+const CACHE_NAME = 'gmail-organizer-__ASSET_HASH__';
+const STATIC_ASSETS = __STATIC_ASSETS__;
 
 // Install: pre-cache static assets
 self.addEventListener('install', (event) => {
@@ -36,7 +36,7 @@ self.addEventListener('activate', (event) => {
   self.clients.claim();
 });
 
-// Fetch: network-first strategy with cache fallback
+// Fetch: cache-first for hashed assets, network-first with cache fallback otherwise
 self.addEventListener('fetch', (event) => {
   // Skip non-GET requests
   if (event.request.method !== 'GET') return;
@@ -50,6 +50,15 @@ self.addEventListener('fetch', (event) => {
     return;
   }
 
+  // Content-hashed assets never change: serve them cache-first
+  const path = new URL(event.request.url).pathname;
+  if (path !== '/' && STATIC_ASSETS.includes(path)) {
+    event.respondWith(
+      caches.match(event.request).then((cached) => cached || fetch(event.request))
+    );
+    return;
+  }
+
   event.respondWith(
     fetch(event.request)
       .then((response) => {
@@ -24,13 +24,16 @@ from gmail_organizer.storage import StorageAnalyzer
 from gmail_organizer.export import EmailExporter
 from gmail_organizer.themes import ThemeManager
 from gmail_organizer.scheduler import SyncScheduler
-from gmail_organizer.notifications import NotificationManager, NotificationEvent, EVENT_TYPES
+from gmail_organizer.notifications import (
+    NotificationManager, NotificationEvent, EVENT_TYPES, PAYLOAD_FORMATS
+)
 from gmail_organizer.multi_label import MultiLabelClassifier
 from gmail_organizer.training import CategoryTrainer
 from gmail_organizer.mobile import MobileLayoutHelper, generate_pwa_icons
 from gmail_organizer.calendar_integration import EmailCalendar
 from gmail_organizer import claude_integration as claude_code
 from collections import Counter
+import atexit
 import time
 
 # Set up logging
@@ -44,6 +47,20 @@ st.set_page_config(
 
 # ==================== SESSION STATE INIT ====================
 
+
+@st.cache_resource
+def _get_notification_manager() -> NotificationManager:
+    """One notification manager per process, shared by every session.
+
+    Each manager owns a delivery thread pool, an HTTP connection pool and a
+    flusher thread, and appends to the shared history log, so sessions must
+    not create their own.
+    """
+    manager = NotificationManager()
+    atexit.register(manager.close)
+    return manager
+
+
 if 'auth_manager' not in st.session_state:
     st.session_state.auth_manager = GmailAuthManager()
 
@@ -69,7 +86,7 @@ if 'scheduler' not in st.session_state:
     st.session_state.scheduler = SyncScheduler()
 
 if 'notification_manager' not in st.session_state:
-    st.session_state.notification_manager = NotificationManager()
+    st.session_state.notification_manager = _get_notification_manager()
 
 if 'category_trainer' not in st.session_state:
     st.session_state.category_trainer = CategoryTrainer()
@@ -609,21 +626,24 @@ def process_with_claude_code_step2(account_name: str):
         applied_count = 0
         category_counts = {}
 
-        for i, email_item in enumerate(emails):
-            email_id = email_item['email_id']
-            category = classifications.get(email_id, 'saved')
-            label_id = label_map.get(category)
-
-            if label_id:
-                success = ops.apply_label_to_email(email_id, label_id)
-                if success:
-                    applied_count += 1
-                    category_counts[category] = category_counts.get(category, 0) + 1
-
-            if (i + 1) % 50 == 0:
-                progress = 50 + int((i + 1) / len(emails) * 50)
-                progress_bar.progress(min(progress, 99))
-                status_text.text(f"Applied {applied_count} labels...")
+        # Group emails by category so each label is applied in bulk
+        ids_by_category = {}
+        for email_item in emails:
+            category = classifications.get(email_item['email_id'], 'saved')
+            if category in label_map:
+                ids_by_category.setdefault(category, []).append(email_item['email_id'])
+
+        processed = 0
+        for category, email_ids in ids_by_category.items():
+            applied = ops.batch_apply_label(email_ids, label_map[category])
+            if applied:
+                applied_count += applied
+                category_counts[category] = applied
+
+            processed += len(email_ids)
+            progress = 50 + int(processed / len(emails) * 50)
+            progress_bar.progress(min(progress, 99))
+            status_text.text(f"Applied {applied_count} labels...")
 
         progress_bar.progress(100)
         status_text.text("Complete!")
@@ -675,7 +695,7 @@ def process_account(account_name: str, emails: list):
         classified_emails = []
 
         for i, email_item in enumerate(emails):
-            body_preview = email_item.get('body_preview', '') if use_body else ""
+            body_preview = (email_item.get('body_preview') or email_item.get('snippet', '')) if use_body else ""
             category, confidence = st.session_state.classifier.classify_email(
                 email_item['subject'],
                 email_item['sender'],
@@ -697,19 +717,22 @@ def process_account(account_name: str, emails: list):
         applied_count = 0
         category_counts = {}
 
-        for i, email_item in enumerate(classified_emails):
-            category = email_item['category']
-            label_id = label_map.get(category)
+        # Group emails by category so each label is applied in bulk
+        ids_by_category = {}
+        for email_item in classified_emails:
+            if email_item['category'] in label_map:
+                ids_by_category.setdefault(email_item['category'], []).append(email_item['email_id'])
 
-            if label_id:
-                success = ops.apply_label_to_email(email_item['email_id'], label_id)
-                if success:
-                    applied_count += 1
-                    category_counts[category] = category_counts.get(category, 0) + 1
+        processed = 0
+        for category, email_ids in ids_by_category.items():
+            applied = ops.batch_apply_label(email_ids, label_map[category])
+            if applied:
+                applied_count += applied
+                category_counts[category] = applied
 
-            if (i + 1) % 10 == 0:
-                progress = 70 + int((i + 1) / len(emails) * 30)
-                progress_bar.progress(min(progress, 99))
+            processed += len(email_ids)
+            progress = 70 + int(processed / len(emails) * 30)
+            progress_bar.progress(min(progress, 99))
 
         progress_bar.progress(100)
         status_text.text("Complete!")
@@ -1416,10 +1439,13 @@ def filters_tab():
                         progress = st.progress(0)
                         created = 0
                         errors = 0
+                        # Shared so labels are listed once for all filters
+                        label_ids = {}
                         for idx, sel_idx in enumerate(selected_indices):
                             rule = rules[sel_idx]
                             success = _create_filter_with_label(
-                                filter_gen, rule, service, account_name, quiet=True
+                                filter_gen, rule, service, account_name, quiet=True,
+                                label_ids=label_ids
                             )
                             if success:
                                 created += 1
@@ -1512,12 +1538,16 @@ def filters_tab():
 
 
 def _create_filter_with_label(filter_gen: SmartFilterGenerator, rule: FilterRule,
-                              service, account_name: str, quiet: bool = False) -> bool:
-    """Create a Gmail filter, creating the label first if needed."""
+                              service, account_name: str, quiet: bool = False,
+                              label_ids: dict = None) -> bool:
+    """Create a Gmail filter, creating the label first if needed.
+
+    label_ids is an optional label cache shared across calls (see _get_or_create_label).
+    """
     try:
         # First ensure the label exists
         label_name = rule.action_label
-        label_id = _get_or_create_label(service, label_name)
+        label_id = _get_or_create_label(service, label_name, label_ids)
 
         if label_id:
             rule.label_id = label_id
@@ -1541,17 +1571,25 @@ def _create_filter_with_label(filter_gen: SmartFilterGenerator, rule: FilterRule
         return False
 
 
-def _get_or_create_label(service, label_name: str) -> str:
-    """Get existing label ID or create a new label, returns label ID."""
+def _get_or_create_label(service, label_name: str, label_ids: dict = None) -> str:
+    """Get existing label ID or create a new label, returns label ID.
+
+    label_ids is an optional lowercased label name -> ID dict shared across
+    calls: the first call fills it from one labels.list request, and created
+    labels are added to it, so later calls skip the list.
+    """
+    if label_ids is None:
+        label_ids = {}
     try:
-        # List existing labels
-        results = service.users().labels().list(userId='me').execute()
-        labels = results.get('labels', [])
+        # List existing labels once per cache
+        if not label_ids:
+            results = service.users().labels().list(userId='me', fields='labels(id,name)').execute()
+            label_ids.update((label['name'].lower(), label['id']) for label in results.get('labels', []))
 
         # Check if label already exists
-        for label in labels:
-            if label['name'].lower() == label_name.lower():
-                return label['id']
+        label_id = label_ids.get(label_name.lower())
+        if label_id:
+            return label_id
 
         # Create the label
         label_body = {
@@ -1562,6 +1600,7 @@ def _get_or_create_label(service, label_name: str) -> str:
         created = service.users().labels().create(
             userId='me', body=label_body
         ).execute()
+        label_ids[label_name.lower()] = created['id']
         return created['id']
     except Exception as e:
         logger.error(f"Error with label '{label_name}': {e}")
@@ -1901,7 +1940,7 @@ def search_tab():
                         if category:
                             st.markdown(f"**Category:** {category}")
 
-                        body = email.get('body_preview', '')
+                        body = email.get('body_preview') or email.get('snippet', '')
                         if body:
                             st.markdown("**Preview:**")
                             st.text(body[:300])
@@ -2326,7 +2365,7 @@ def priority_tab():
                 st.markdown(f"**Date:** {email.get('date', '')[:20]}")
                 if email.get('category'):
                     st.markdown(f"**Category:** {email['category']}")
-                body = email.get('body_preview', '')
+                body = email.get('body_preview') or email.get('snippet', '')
                 if body:
                     st.text(body[:200])
             with col2:
@@ -3159,6 +3198,12 @@ def notifications_tab():
             )
             webhook_secret = st.text_input("Secret (optional)", type="password",
                                            help="Used for HMAC signature verification")
+            webhook_format = st.selectbox(
+                "Payload format",
+                options=list(PAYLOAD_FORMATS.keys()),
+                format_func=lambda x: f"{x} ({PAYLOAD_FORMATS[x]})",
+                help="msgpack payloads are smaller and faster to decode",
+            )
 
             if st.form_submit_button("Add Webhook", type="primary"):
                 if webhook_url:
@@ -3167,6 +3212,7 @@ def notifications_tab():
                         name=webhook_name,
                         events=webhook_events,
                         secret=webhook_secret,
+                        format=webhook_format,
                     )
                     st.success(f"Webhook added: {webhook_name or webhook_url[:30]}")
                     st.rerun()
@@ -3186,9 +3232,17 @@ def notifications_tab():
                 with st.expander(f"{status_icon} {wh.name or wh.url[:40]}{fail_text}"):
                     st.markdown(f"**URL:** `{wh.url}`")
                     st.markdown(f"**Events:** {', '.join(wh.events)}")
+                    st.markdown(f"**Format:** {wh.format}")
                     st.markdown(f"**Enabled:** {'Yes' if wh.enabled else 'No'}")
                     if wh.last_triggered:
                         st.markdown(f"**Last triggered:** {wh.last_triggered[:19]}")
+                    from datetime import datetime
+                    if wh.cooldown_until > datetime.now().timestamp():
+                        paused_until = datetime.fromtimestamp(wh.cooldown_until)
+                        st.markdown(
+                            f"**Paused after repeated failures until:** "
+                            f"{paused_until.isoformat()[:19]}"
+                        )
 
                     btn_col1, btn_col2 = st.columns(2)
                     with btn_col1:
@@ -3225,10 +3279,12 @@ def notifications_tab():
                 }.get(entry.get("event_type", ""), "📧")
 
                 timestamp = entry.get("timestamp", "")[:19]
+                duplicates = entry.get("duplicates", 0)
+                dup_text = f" (+{duplicates} duplicate(s))" if duplicates else ""
                 st.markdown(
                     f"{event_icon} **{entry.get('title', '')}** "
                     f"({entry.get('account_name', '')}) - "
-                    f"{entry.get('webhooks_fired', 0)} webhook(s) - "
+                    f"{entry.get('webhooks_fired', 0)} webhook(s){dup_text} - "
                     f"`{timestamp}`"
                 )
 
@@ -3,13 +3,65 @@
 import os
 import json
 import pickle
+from functools import lru_cache
 from pathlib import Path
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build, build_from_document
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 from .config import SCOPES, CREDENTIALS_DIR, TOKEN_PREFIX
+from . import jsonio
+
+
+class _FastJsonModel(JsonModel):
+    """JsonModel that parses API responses with jsonio (orjson when installed)
+
+    Responses are parsed straight from bytes, skipping the UTF-8 decode
+    step of the stock model.
+    """
+
+    def deserialize(self, content):
+        try:
+            body = jsonio.loads(content)
+        except ValueError:
+            return content.decode('utf-8') if isinstance(content, bytes) else content
+        if self._data_wrapper and isinstance(body, dict) and "data" in body:
+            body = body["data"]
+        return body
+
+
+@lru_cache(maxsize=1)
+def _gmail_discovery_doc() -> bytes:
+    """Read the Gmail discovery document bundled with google-api-python-client"""
+    doc = discovery_cache.get_static_doc('gmail', 'v1')
+    return doc.encode('utf-8') if doc else b''
+
+
+def build_service(creds):
+    """
+    Build a Gmail API service without fetching its discovery document
+
+    The bundled discovery document is read from disk once per process and
+    parsed fresh for each service (building a service mutates it). API
+    responses are parsed with jsonio (orjson when installed).
+
+    Args:
+        creds: OAuth credentials for the account
+
+    Returns:
+        Gmail API service resource
+    """
+    doc = _gmail_discovery_doc()
+    if not doc:
+        # Fall back to normal discovery if the document isn't bundled
+        return build('gmail', 'v1', credentials=creds, cache_discovery=False,
+                     model=_FastJsonModel())
+    service_doc = jsonio.loads(doc)
+    model = _FastJsonModel('dataWrapper' in service_doc.get('features', []))
+    return build_from_document(service_doc, credentials=creds, model=model)
 
 
 class GmailAuthManager:
@@ -63,7 +115,7 @@ class GmailAuthManager:
                 creds = flow.run_local_server(port=0)
 
                 # Get email address for this account
-                service = build('gmail', 'v1', credentials=creds)
+                service = build_service(creds)
                 profile = service.users().getProfile(userId='me').execute()
                 email = profile['emailAddress']
 
@@ -81,7 +133,7 @@ class GmailAuthManager:
                 return service, email, account_name
 
         # Build service with existing credentials
-        service = build('gmail', 'v1', credentials=creds)
+        service = build_service(creds)
         profile = service.users().getProfile(userId='me').execute()
         email = profile['emailAddress']
 
@@ -122,7 +174,7 @@ class GmailAuthManager:
             try:
                 with open(token_file, 'rb') as f:
                     creds = pickle.load(f)
-                    service = build('gmail', 'v1', credentials=creds)
+                    service = build_service(creds)
                     profile = service.users().getProfile(userId='me').execute()
                     email = profile['emailAddress']
                     accounts.append((account_name, email))
@@ -12,6 +12,8 @@ class BulkActionEngine:
 
     def __init__(self, service=None):
         self.service = service
+        # Lowercased label name -> ID, from the first labels.list call
+        self._label_name_to_id: Optional[Dict[str, str]] = None
 
     def apply_label(self, message_ids: List[str], label_id: str,
                     progress_callback: Optional[Callable] = None) -> Dict:
@@ -163,12 +165,12 @@ class BulkActionEngine:
             return None
 
         try:
-            results = self.service.users().labels().list(userId='me').execute()
-            labels = results.get('labels', [])
+            if self._label_name_to_id is None:
+                self._fetch_labels()
 
-            for label in labels:
-                if label['name'].lower() == label_name.lower():
-                    return label['id']
+            label_id = self._label_name_to_id.get(label_name.lower())
+            if label_id:
+                return label_id
 
             # Create new label
             label_body = {
@@ -179,6 +181,7 @@ class BulkActionEngine:
             created = self.service.users().labels().create(
                 userId='me', body=label_body
             ).execute()
+            self._label_name_to_id[label_name.lower()] = created['id']
             return created['id']
         except HttpError as e:
             return None
@@ -189,11 +192,21 @@ class BulkActionEngine:
             return []
 
         try:
-            results = self.service.users().labels().list(userId='me').execute()
-            return results.get('labels', [])
+            return self._fetch_labels()
         except HttpError:
             return []
 
+    def _fetch_labels(self) -> List[Dict]:
+        """List all Gmail labels and refresh the label name cache
+
+        Raises:
+            HttpError: If the labels cannot be listed
+        """
+        results = self.service.users().labels().list(userId='me').execute()
+        labels = results.get('labels', [])
+        self._label_name_to_id = {label['name'].lower(): label['id'] for label in labels}
+        return labels
+
 
 def filter_emails(emails: List[Dict],
                   sender_filter: str = "",
@@ -114,6 +114,18 @@ If uncertain, respond with your best guess based on the context.
 BATCH_SIZE = 100  # Process emails in batches
 MAX_EMAILS = None  # None = process all, or set a number for testing
 
+# Fetching: download full message bodies to build body_preview. When disabled,
+# only headers are requested (format=metadata) and body_preview is left empty.
+FETCH_BODY_PREVIEW = os.getenv("GMAIL_ORGANIZER_FETCH_BODY_PREVIEW", "true").lower() not in ("0", "false", "no")
+
+# Fetching: concurrent batch requests, and the message rate they share
+# (Gmail allows 15,000 quota units/min per user; messages.get costs 5)
+FETCH_WORKERS = int(os.getenv("GMAIL_ORGANIZER_FETCH_WORKERS", "4"))
+FETCH_MESSAGES_PER_MINUTE = int(os.getenv("GMAIL_ORGANIZER_FETCH_MESSAGES_PER_MINUTE", "1500"))
+
+# Notifications: seconds to cache the webhooks matching each event type
+WEBHOOK_CACHE_TTL = float(os.getenv("GMAIL_ORGANIZER_WEBHOOK_CACHE_TTL", "60"))
+
 # Credentials storage
 CREDENTIALS_DIR = "credentials"
 TOKEN_PREFIX = "token_"
@@ -321,9 +321,18 @@ class DuplicateDetector:
             if ra != rb:
                 parent[ra] = rb
 
+        # Read each email's subject and date once, not once per pair
+        subjects = [
+            self._normalize_subject(self._get_header(email, "Subject") or "")
+            for email in emails
+        ]
+        dates = [self._get_internal_date(email) for email in emails]
+
         for i in range(n):
             for j in range(i + 1, n):
-                if self._are_similar(emails[i], emails[j]):
+                if self._subjects_and_dates_similar(
+                    subjects[i], dates[i], subjects[j], dates[j]
+                ):
                     union(i, j)
 
         clusters_map: Dict[int, List[Dict]] = defaultdict(list)
@@ -353,17 +362,19 @@ class DuplicateDetector:
             if ra != rb:
                 parent[ra] = rb
 
+        # Read each email's subject and date once, not once per pair
+        subjects = [
+            self._normalize_subject(self._get_header(email, "Subject") or "")
+            for email in emails
+        ]
+        dates = [self._get_internal_date(email) for email in emails]
+
         for i in range(n):
             for j in range(i + 1, n):
-                subj_i = self._normalize_subject(
-                    self._get_header(emails[i], "Subject") or ""
-                )
-                subj_j = self._normalize_subject(
-                    self._get_header(emails[j], "Subject") or ""
-                )
-                if subj_i == subj_j and subj_i:
-                    date_i = self._get_internal_date(emails[i])
-                    date_j = self._get_internal_date(emails[j])
+                subj_i = subjects[i]
+                if subj_i == subjects[j] and subj_i:
+                    date_i = dates[i]
+                    date_j = dates[j]
                     if date_i and date_j:
                         diff = abs((date_i - date_j).total_seconds())
                         if diff <= self.DATE_PROXIMITY_SECONDS:
@@ -380,10 +391,21 @@ class DuplicateDetector:
         subj_a = self._get_header(email_a, "Subject") or ""
         subj_b = self._get_header(email_b, "Subject") or ""
 
-        # Compare normalized subjects
-        norm_a = self._normalize_subject(subj_a)
-        norm_b = self._normalize_subject(subj_b)
+        return self._subjects_and_dates_similar(
+            self._normalize_subject(subj_a),
+            self._get_internal_date(email_a),
+            self._normalize_subject(subj_b),
+            self._get_internal_date(email_b),
+        )
 
+    def _subjects_and_dates_similar(
+        self,
+        norm_a: str,
+        date_a: Optional[datetime],
+        norm_b: str,
+        date_b: Optional[datetime],
+    ) -> bool:
+        """Compare pre-normalized subjects and internal dates of two emails."""
         if not norm_a or not norm_b:
             return False
 
@@ -392,8 +414,6 @@ class DuplicateDetector:
             return False
 
         # Check date proximity
-        date_a = self._get_internal_date(email_a)
-        date_b = self._get_internal_date(email_b)
         if date_a and date_b:
             diff = abs((date_a - date_b).total_seconds())
             if diff > self.DATE_PROXIMITY_SECONDS:
@@ -499,8 +519,9 @@ class DuplicateDetector:
         """Extract a header value from an email's payload."""
         payload = email.get("payload", {})
         headers = payload.get("headers", [])
+        header_name = header_name.lower()
         for header in headers:
-            if header.get("name", "").lower() == header_name.lower():
+            if header.get("name", "").lower() == header_name:
                 return header.get("value", "")
         return None
 
@@ -221,7 +221,7 @@ class SmartFilterGenerator:
                 return False
 
         if 'hasTheWord' in criteria:
-            body = email.get('body_preview', '').lower()
+            body = (email.get('body_preview') or email.get('snippet', '')).lower()
             full_text = f"{subject} {body}"
             if criteria['hasTheWord'].lower() not in full_text:
                 return False
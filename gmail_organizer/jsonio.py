@@ -0,0 +1,239 @@
+"""JSON encoding and atomic file-write helpers (orjson when installed).
+
+orjson is an optional dependency (``pip install gmail-organizer[fast]``).
+Without it these helpers fall back to the standard library ``json`` module
+with the same bytes-in/bytes-out interface. The same extra installs
+zstandard, which enables zstd-compressed JSONL files (``*.jsonl.zst``).
+"""
+
+import dataclasses
+import json
+import mmap
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+ZSTD_SUFFIX = ".zst"
+ZSTD_LEVEL = 3
+
+# Uncompressed JSONL files at least this large are memory-mapped when read
+MMAP_THRESHOLD = 8 << 20
+
+# Suffix for newly written JSONL files: compressed when zstandard is installed
+JSONL_SUFFIX = ".jsonl" + ZSTD_SUFFIX if zstandard is not None else ".jsonl"
+
+
+def _default(obj: Any) -> Any:
+    """Encode dataclass instances for the stdlib fallback.
+
+    Fields are read directly rather than through dataclasses.asdict(),
+    which deep-copies every value. orjson handles dataclasses natively.
+    """
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON bytes.
+
+    Dataclass instances are serialized as objects of their fields.
+
+    Args:
+        obj: The object to serialize.
+        indent: Pretty-print with two-space indentation.
+
+    Returns:
+        The JSON document as bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, indent=2, default=_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data: Union[bytes, str]) -> Any:
+    """Deserialize JSON from bytes or str.
+
+    Raises:
+        ValueError: If the data is not valid JSON.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def atomic_write_bytes(path: Union[str, Path], data: bytes):
+    """Write bytes to a file atomically.
+
+    The data is written and fsynced to a uniquely named sibling temp file
+    which then replaces the target, so readers never observe a partially
+    written file even if the process crashes mid-write, and concurrent
+    writers never share a temp file.
+
+    Args:
+        path: Destination file path.
+        data: File contents.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    path = Path(path)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_name, path)
+    except OSError:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _open_binary(path: Union[str, Path]):
+    """Open a file for binary reading, decompressing ``.zst`` files."""
+    if str(path).endswith(ZSTD_SUFFIX):
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to read {path}")
+        return zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+    return open(path, "rb")
+
+
+def write_jsonl(path: Union[str, Path], records: Iterable[Any]):
+    """Write records to a JSON Lines file atomically.
+
+    Paths ending in ``.zst`` are zstd-compressed.
+
+    Args:
+        path: Destination file path.
+        records: Records to serialize, one per line.
+
+    Raises:
+        ImportError: If compression is requested without zstandard installed.
+        OSError: If the file cannot be written.
+    """
+    data = b"".join(dumps(record) + b"\n" for record in records)
+    if str(path).endswith(ZSTD_SUFFIX):
+        if zstandard is None:
+            raise ImportError(f"zstandard is required to write {path}")
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    atomic_write_bytes(path, data)
+
+
+def iter_jsonl(path: Union[str, Path], chunk_size: int = 1 << 20,
+               skip_invalid: bool = False) -> Iterator[Any]:
+    """Stream records from a JSON Lines file.
+
+    The file is read as raw bytes in fixed-size chunks and split on newlines,
+    skipping the text decoding and per-line readline overhead of a text-mode
+    file iterator. Blank lines are ignored. ``.zst`` files are decompressed
+    on the fly; uncompressed files of MMAP_THRESHOLD bytes or more are
+    memory-mapped instead of copied through a read buffer.
+
+    Args:
+        path: JSONL file to read.
+        chunk_size: Bytes to read per chunk.
+        skip_invalid: Skip lines that are not valid JSON (e.g. a record torn
+            by a crash mid-append) instead of raising.
+
+    Yields:
+        One deserialized record per non-blank line.
+
+    Raises:
+        OSError: If the file cannot be read.
+        ValueError: If a line is not valid JSON and skip_invalid is False.
+    """
+    if not str(path).endswith(ZSTD_SUFFIX) and os.path.getsize(path) >= MMAP_THRESHOLD:
+        yield from _iter_jsonl_mmap(path, skip_invalid)
+        return
+
+    tail = b""
+    with _open_binary(path) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            lines = (tail + chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield from _load_line(line, skip_invalid)
+    if tail.strip():
+        yield from _load_line(tail, skip_invalid)
+
+
+def count_lines(path: Union[str, Path], chunk_size: int = 1 << 20) -> int:
+    """Count newline-terminated lines in a file without decoding it.
+
+    ``.zst`` files are decompressed on the fly.
+
+    Args:
+        path: File to scan.
+        chunk_size: Bytes to read per chunk.
+
+    Returns:
+        The number of newline characters in the file.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    count = 0
+    with _open_binary(path) as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return count
+            count += chunk.count(b"\n")
+
+
+def _iter_jsonl_mmap(path: Union[str, Path], skip_invalid: bool) -> Iterator[Any]:
+    """Stream JSONL records from a memory-mapped file.
+
+    Lines are handed to orjson as zero-copy memoryview slices of the
+    mapping; the stdlib fallback needs them copied to bytes.
+    """
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        view = memoryview(mm)
+        size = len(mm)
+        start = 0
+        try:
+            while start < size:
+                end = mm.find(b"\n", start)
+                if end == -1:
+                    end = size
+                # Only very short lines can be blank (whitespace-only)
+                if end - start > 2 or mm[start:end].strip():
+                    line = view[start:end] if orjson is not None else mm[start:end]
+                    try:
+                        yield from _load_line(line, skip_invalid)
+                    finally:
+                        # Slices must be released before the mapping closes
+                        if isinstance(line, memoryview):
+                            line.release()
+                start = end + 1
+        finally:
+            view.release()
+
+
+def _load_line(line: bytes, skip_invalid: bool) -> Iterator[Any]:
+    """Decode one JSONL line, yielding nothing for a skipped invalid line."""
+    try:
+        record = loads(line)
+    except ValueError:
+        if not skip_invalid:
+            raise
+        return
+    yield record
@@ -123,17 +123,17 @@ class GmailOrganizer:
         applied_count = 0
         category_counts = {}
 
+        # Group emails by category so each label is applied in bulk
+        ids_by_category = {}
         for email_item in classified_emails:
-            category = email_item['category']
-            label_id = label_map.get(category)
-
-            if label_id:
-                success = ops.apply_label_to_email(email_item['email_id'], label_id)
-                if success:
-                    applied_count += 1
-                    category_counts[category] = category_counts.get(category, 0) + 1
-
-            if applied_count % 10 == 0 and applied_count > 0:
+            if email_item['category'] in label_map:
+                ids_by_category.setdefault(email_item['category'], []).append(email_item['email_id'])
+
+        for category, email_ids in ids_by_category.items():
+            applied = ops.batch_apply_label(email_ids, label_map[category])
+            if applied:
+                applied_count += applied
+                category_counts[category] = applied
                 print(f"  Applied {applied_count}/{len(emails)} labels...")
 
         # Store results
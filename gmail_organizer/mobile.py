@@ -1,14 +1,32 @@
 """Mobile companion and PWA support for Gmail Organizer."""
 
 import base64
+import hashlib
+import json
+import re
 import struct
 import zlib
 from pathlib import Path
+from urllib.parse import quote
 from typing import Dict, Optional
 
 
-# PWA meta tags and service worker registration
-PWA_HEAD_HTML = """
+# URL prefix under which Streamlit serves the static directory
+STATIC_URL_PREFIX = "/app/static/"
+
+# Static assets published under content-hashed filenames. A hashed name
+# never changes content, so the service worker serves them cache-first.
+HASHED_ASSETS = ["manifest.json", "mobile.css", "icon-192.png"]
+
+ASSET_MANIFEST_FILE = "asset_manifest.json"
+# Matches the "<sha256[:8]>" part _hashed_name() inserts into a file name
+_ASSET_HASH_RE = re.compile(r"[0-9a-f]{8}")
+SERVICE_WORKER_TEMPLATE = "service-worker.template.js"
+SERVICE_WORKER_FILE = "service-worker.js"
+
+# PWA meta tags and service worker registration; asset URLs are filled in by
+# get_pwa_head_html() from the asset manifest.
+PWA_HEAD_TEMPLATE = """
 <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no">
 <meta name="apple-mobile-web-app-capable" content="yes">
 <meta name="apple-mobile-web-app-status-bar-style" content="black-translucent">
@@ -16,21 +34,21 @@ PWA_HEAD_HTML = """
 <meta name="mobile-web-app-capable" content="yes">
 <meta name="theme-color" content="#1f77b4">
 <meta name="msapplication-TileColor" content="#1f77b4">
-<link rel="manifest" href="/app/static/manifest.json">
-<link rel="apple-touch-icon" href="/app/static/icon-192.png">
-<link rel="stylesheet" href="/app/static/mobile.css">
+<link rel="manifest" href="{manifest}">
+<link rel="apple-touch-icon" href="{icon}">
+<link rel="stylesheet" href="{css}">
 <script>
-if ('serviceWorker' in navigator) {
-    window.addEventListener('load', function() {
-        navigator.serviceWorker.register('/app/static/service-worker.js', {scope: '/'})
-            .then(function(registration) {
+if ('serviceWorker' in navigator) {{
+    window.addEventListener('load', function() {{
+        navigator.serviceWorker.register('{service_worker}', {{scope: '/'}})
+            .then(function(registration) {{
                 console.log('SW registered:', registration.scope);
-            })
-            .catch(function(error) {
+            }})
+            .catch(function(error) {{
                 console.log('SW registration failed:', error);
-            });
-    });
-}
+            }});
+    }});
+}}
 </script>
 """
 
@@ -93,6 +111,172 @@ MOBILE_COMPACT_CSS = """
 </style>
 """
 
+# Brand color: Gmail Organizer blue
+BRAND_COLOR_HEX = "#1f77b4"
+BRAND_COLOR_RGB = (31, 119, 180)
+
+PWA_ICON_SIZES = [192, 512]
+
+# Web app manifest; icon entries are filled in by generate_pwa_icons()
+PWA_MANIFEST = {
+    "name": "Gmail Organizer",
+    "short_name": "GmailOrg",
+    "description": "Intelligent email organization and management tool",
+    "start_url": "/",
+    "display": "standalone",
+    "background_color": "#0e1117",
+    "theme_color": BRAND_COLOR_HEX,
+    "orientation": "any",
+    "icons": [],
+    "categories": ["productivity", "utilities"],
+    "screenshots": [],
+    "prefer_related_applications": False,
+}
+
+
+def _svg_icon_data_uri(size: int, color: str) -> str:
+    """Build a flat-color square SVG icon as a data URI.
+
+    Args:
+        size: Icon width and height in pixels.
+        color: CSS hex color (e.g. "#1f77b4").
+
+    Returns:
+        A ``data:image/svg+xml`` URI usable directly in a web app manifest.
+    """
+    svg = (
+        f"<svg xmlns='http://www.w3.org/2000/svg' width='{size}' height='{size}' "
+        f"viewBox='0 0 {size} {size}'>"
+        f"<rect width='{size}' height='{size}' fill='{color}'/></svg>"
+    )
+    return "data:image/svg+xml;utf8," + quote(svg, safe="/:=' ")
+
+
+def _default_static_dir() -> Path:
+    """Return the default Streamlit static directory (.streamlit/static/)."""
+    return Path(__file__).parent.parent / ".streamlit" / "static"
+
+
+def _hashed_name(filename: str, data: bytes) -> str:
+    """Insert a short content hash before the file extension.
+
+    Args:
+        filename: Logical asset name (e.g. "mobile.css").
+        data: File contents.
+
+    Returns:
+        Hashed name such as "mobile.3f2a9c1b.css".
+    """
+    digest = hashlib.sha256(data).hexdigest()[:8]
+    stem, dot, ext = filename.rpartition(".")
+    return f"{stem}.{digest}.{ext}" if dot else f"{filename}.{digest}"
+
+
+def write_asset_manifest(static_dir: Optional[str] = None) -> Dict[str, str]:
+    """Publish content-hashed copies of the PWA static assets.
+
+    Each asset in HASHED_ASSETS is copied to a name containing a hash of its
+    contents, and the logical -> hashed mapping is stored in
+    asset_manifest.json. service-worker.js is rendered from its template with
+    the cache name pinned to the combined asset hash, so a deploy with
+    changed assets invalidates old caches automatically. The service worker
+    itself keeps a stable name, as browsers look it up by URL for updates.
+    Hashed copies of earlier asset versions are deleted. All of these files
+    are generated at startup and are not tracked in git.
+
+    Args:
+        static_dir: Path to the static directory. Defaults to .streamlit/static/.
+
+    Returns:
+        Dict mapping logical asset names to hashed file names.
+    """
+    assets_dir = Path(static_dir) if static_dir else _default_static_dir()
+
+    asset_map = {}
+    for name in HASHED_ASSETS:
+        source = assets_dir / name
+        if not source.exists():
+            continue
+        data = source.read_bytes()
+        hashed = _hashed_name(name, data)
+        target = assets_dir / hashed
+        if not target.exists():
+            target.write_bytes(data)
+        asset_map[name] = hashed
+
+    # Remove hashed copies of earlier asset versions
+    for name in HASHED_ASSETS:
+        stem, _, ext = name.rpartition(".")
+        for path in assets_dir.glob(f"{stem}.*.{ext}"):
+            digest = path.name[len(stem) + 1:-len(ext) - 1]
+            if _ASSET_HASH_RE.fullmatch(digest) and path.name != asset_map.get(name):
+                path.unlink(missing_ok=True)
+
+    manifest_path = assets_dir / ASSET_MANIFEST_FILE
+    manifest_text = json.dumps(asset_map, indent=2, sort_keys=True) + "\n"
+    if not manifest_path.exists() or manifest_path.read_text() != manifest_text:
+        manifest_path.write_text(manifest_text)
+
+    template_path = assets_dir / SERVICE_WORKER_TEMPLATE
+    if template_path.exists():
+        asset_hash = hashlib.sha256(manifest_text.encode()).hexdigest()[:8]
+        static_assets = ["/"] + [
+            STATIC_URL_PREFIX + asset_map[name]
+            for name in ("manifest.json", "mobile.css")
+            if name in asset_map
+        ]
+        worker = (
+            template_path.read_text()
+            .replace("__ASSET_HASH__", asset_hash)
+            .replace("__STATIC_ASSETS__", json.dumps(static_assets))
+        )
+        worker_path = assets_dir / SERVICE_WORKER_FILE
+        if not worker_path.exists() or worker_path.read_text() != worker:
+            worker_path.write_text(worker)
+
+    return asset_map
+
+
+def load_asset_manifest(static_dir: Optional[str] = None) -> Dict[str, str]:
+    """Load the logical -> hashed asset name mapping.
+
+    Args:
+        static_dir: Path to the static directory. Defaults to .streamlit/static/.
+
+    Returns:
+        The mapping, or an empty dict if no asset manifest has been written.
+    """
+    assets_dir = Path(static_dir) if static_dir else _default_static_dir()
+    try:
+        return json.loads((assets_dir / ASSET_MANIFEST_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def get_pwa_head_html(asset_map: Optional[Dict[str, str]] = None) -> str:
+    """Render the PWA head HTML with content-hashed asset URLs.
+
+    Args:
+        asset_map: Logical -> hashed name mapping. Loaded from the asset
+            manifest if not given; assets missing from it use their
+            logical (unhashed) names.
+
+    Returns:
+        HTML string to inject via st.markdown(unsafe_allow_html=True).
+    """
+    if asset_map is None:
+        asset_map = load_asset_manifest()
+
+    def url(name: str) -> str:
+        return STATIC_URL_PREFIX + asset_map.get(name, name)
+
+    return PWA_HEAD_TEMPLATE.format(
+        manifest=url("manifest.json"),
+        icon=url("icon-192.png"),
+        css=url("mobile.css"),
+        service_worker=STATIC_URL_PREFIX + SERVICE_WORKER_FILE,
+    )
+
 
 def _create_png(width: int, height: int, color: tuple) -> bytes:
     """Generate a minimal single-color PNG image.
@@ -136,30 +320,47 @@ def _create_png(width: int, height: int, color: tuple) -> bytes:
     return png
 
 
-def generate_pwa_icons(static_dir: Optional[str] = None):
-    """Generate PWA icon PNG files if they don't exist.
+def generate_pwa_icons(static_dir: Optional[str] = None, png_fallback: bool = False):
+    """Write the PWA manifest with inline SVG icons.
 
-    Creates simple branded icons in the Streamlit static directory.
+    Icons are flat-color squares, so they are embedded in the manifest as
+    SVG data URIs rather than generated as PNG files. PNG bitmaps are only
+    rendered when ``png_fallback`` is set (e.g. for platforms that cannot
+    use SVG icons) and the files don't already exist. Content-hashed copies
+    of the static assets are then published via write_asset_manifest().
 
     Args:
         static_dir: Path to the static directory. Defaults to .streamlit/static/.
+        png_fallback: Also write icon-<size>.png files if missing.
     """
-    if static_dir:
-        icons_dir = Path(static_dir)
-    else:
-        icons_dir = Path(__file__).parent.parent / ".streamlit" / "static"
+    icons_dir = Path(static_dir) if static_dir else _default_static_dir()
 
     icons_dir.mkdir(parents=True, exist_ok=True)
 
-    # Brand color: Gmail Organizer blue
-    brand_color = (31, 119, 180)
+    manifest = dict(PWA_MANIFEST)
+    manifest["icons"] = [
+        {
+            "src": _svg_icon_data_uri(size, BRAND_COLOR_HEX),
+            "sizes": f"{size}x{size}",
+            "type": "image/svg+xml",
+            "purpose": "any maskable",
+        }
+        for size in PWA_ICON_SIZES
+    ]
+
+    manifest_path = icons_dir / "manifest.json"
+    manifest_text = json.dumps(manifest, indent=2) + "\n"
+    if not manifest_path.exists() or manifest_path.read_text() != manifest_text:
+        manifest_path.write_text(manifest_text)
+
+    if png_fallback:
+        for size in PWA_ICON_SIZES:
+            icon_path = icons_dir / f"icon-{size}.png"
+            if not icon_path.exists():
+                png_data = _create_png(size, size, BRAND_COLOR_RGB)
+                icon_path.write_bytes(png_data)
 
-    icon_sizes = [192, 512]
-    for size in icon_sizes:
-        icon_path = icons_dir / f"icon-{size}.png"
-        if not icon_path.exists():
-            png_data = _create_png(size, size, brand_color)
-            icon_path.write_bytes(png_data)
+    write_asset_manifest(str(icons_dir))
 
 
 class MobileLayoutHelper:
@@ -171,14 +372,19 @@ class MobileLayoutHelper:
 
     def __init__(self):
         self._is_compact = False
+        self._pwa_html: Optional[str] = None
 
     def get_pwa_html(self) -> str:
         """Get the HTML for PWA meta tags and service worker registration.
 
+        Asset URLs point at the content-hashed files from the asset manifest.
+
         Returns:
             HTML string to inject via st.markdown(unsafe_allow_html=True).
         """
-        return PWA_HEAD_HTML
+        if self._pwa_html is None:
+            self._pwa_html = get_pwa_head_html()
+        return self._pwa_html
 
     def get_mobile_css(self) -> str:
         """Get the mobile-responsive CSS.
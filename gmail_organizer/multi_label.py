@@ -5,8 +5,25 @@ from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Set, Tuple
 
+_DOMAIN_RE = re.compile(r"@([\w.-]+)")
 
-@dataclass
+
+def _extract_domain(sender: str) -> str:
+    """Extract the lowercased domain from a sender address.
+
+    Handles the common "Name <user@host>" / "user@host" forms with plain
+    string operations and only falls back to the regex for unusual input.
+    """
+    if "@" not in sender:
+        return ""
+    domain = sender.rsplit("@", 1)[1].split(">", 1)[0].rstrip()
+    if domain and domain.replace(".", "").replace("-", "").replace("_", "").isalnum():
+        return domain.lower()
+    match = _DOMAIN_RE.search(sender)
+    return match.group(1).lower() if match else ""
+
+
+@dataclass(slots=True)
 class ClassificationRule:
     """A rule for classifying emails into a category."""
 
@@ -18,6 +35,12 @@ class ClassificationRule:
     weight: float = 1.0
     description: str = ""
 
+    # Compiled patterns, populated in __post_init__ (declared for __slots__)
+    _compiled_sender: list = field(default_factory=list, init=False, repr=False, compare=False)
+    _compiled_subject: list = field(default_factory=list, init=False, repr=False, compare=False)
+    _compiled_body: list = field(default_factory=list, init=False, repr=False, compare=False)
+    _compiled_domain: list = field(default_factory=list, init=False, repr=False, compare=False)
+
     def __post_init__(self):
         self._compiled_sender = self._safe_compile(self.sender_patterns)
         self._compiled_subject = self._safe_compile(self.subject_patterns)
@@ -36,7 +59,7 @@ class ClassificationRule:
         return compiled
 
 
-@dataclass
+@dataclass(slots=True)
 class LabelAssignment:
     """A label assignment with confidence score."""
 
@@ -45,7 +68,7 @@ class LabelAssignment:
     matched_rules: List[str] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassificationResult:
     """Result of classifying a single email."""
 
@@ -190,11 +213,7 @@ class MultiLabelClassifier:
         subject = email.get("subject", "").lower()
         body = email.get("body", email.get("snippet", "")).lower()
 
-        # Extract domain from sender
-        domain = ""
-        match = re.search(r"@([\w.-]+)", sender)
-        if match:
-            domain = match.group(1).lower()
+        domain = _extract_domain(sender)
 
         label_scores: Dict[str, Tuple[float, List[str]]] = defaultdict(lambda: (0.0, []))
 
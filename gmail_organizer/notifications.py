@@ -1,13 +1,37 @@
 """Webhook and notification system for Gmail Organizer events."""
 
-import json
+import hashlib
+import hmac
 import threading
-import urllib.request
-import urllib.error
-from dataclasses import dataclass, field, asdict
-from datetime import datetime
+import time
+from collections import Counter, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import jsonio
+from .config import WEBHOOK_CACHE_TTL
+from .logger import logger
+
+try:
+    import msgspec
+except ImportError:  # msgpack payloads are optional
+    msgspec = None
+
+# Reused across calls to avoid per-payload encoder setup
+_MSGPACK_ENCODER = msgspec.msgpack.Encoder() if msgspec is not None else None
+
+
+def _utc_isoformat(timestamp_ns: int) -> str:
+    """Format an epoch timestamp in nanoseconds as a UTC ISO 8601 string."""
+    return datetime.fromtimestamp(timestamp_ns / 1e9, tz=timezone.utc).isoformat()
 
 
 @dataclass
@@ -20,10 +44,11 @@ class NotificationEvent:
     message: str
     timestamp: str = ""
     data: Dict = field(default_factory=dict)
+    timestamp_ns: int = field(default_factory=time.time_ns)  # epoch nanoseconds
 
     def __post_init__(self):
         if not self.timestamp:
-            self.timestamp = datetime.now().isoformat()
+            self.timestamp = _utc_isoformat(self.timestamp_ns)
 
 
 @dataclass
@@ -37,6 +62,8 @@ class WebhookConfig:
     secret: str = ""
     last_triggered: str = ""
     failure_count: int = 0
+    format: str = "json"  # payload wire format, see PAYLOAD_FORMATS
+    cooldown_until: float = 0.0  # epoch seconds; deliveries skipped until then
 
 
 # Available event types
@@ -49,20 +76,47 @@ EVENT_TYPES = {
     "export_complete": "Email export completed",
 }
 
+# Webhook payload wire formats and their Content-Type. "msgpack" requires
+# the optional msgspec package; without it those webhooks receive JSON.
+PAYLOAD_FORMATS = {
+    "json": "application/json",
+    "msgpack": "application/msgpack",
+}
+
+# Request headers per payload format; copied only when a signature is added
+_BASE_HEADERS = {
+    fmt: {"Content-Type": content_type, "User-Agent": "GmailOrganizer/1.0"}
+    for fmt, content_type in PAYLOAD_FORMATS.items()
+}
+
 
 class NotificationManager:
     """Manages webhooks and in-app notifications."""
 
     CONFIG_FILE = "notification_config.json"
-    HISTORY_FILE = "notification_history.json"
+    HISTORY_FILE = "notification_history.jsonl"  # append-only, one entry per line
+    LEGACY_HISTORY_FILE = "notification_history.json"
     MAX_HISTORY = 100
-
-    def __init__(self, config_dir: Optional[str] = None):
+    FLUSH_INTERVAL = 0.5  # seconds; coalesces bursts of changes into one write
+    # Delivery bookkeeping (last_triggered, failure_count, cooldown_until) is
+    # only persisted this often, or along with the next config change
+    DELIVERY_FLUSH_INTERVAL = 30.0
+    # Circuit breaker: after FAILURE_THRESHOLD consecutive failures a webhook
+    # is skipped for 2**failure_count seconds, capped at MAX_COOLDOWN
+    FAILURE_THRESHOLD = 3
+    MAX_COOLDOWN = 3600
+    # Identical events within DEDUPE_WINDOW seconds are collapsed into the
+    # first one, except for event types that must always be delivered
+    DEDUPE_WINDOW = 5.0
+    DEDUPE_EXCLUDED_EVENTS = frozenset({"security_alert"})
+
+    def __init__(self, config_dir: Optional[str] = None, max_workers: int = 16):
         """Initialize the notification manager.
 
         Args:
             config_dir: Directory for config/history files.
                        Defaults to .sync-state/ in project root.
+            max_workers: Size of the thread pool used to deliver webhooks.
         """
         if config_dir:
             self._config_dir = Path(config_dir)
@@ -71,14 +125,105 @@ class NotificationManager:
         self._config_dir.mkdir(exist_ok=True)
 
         self._webhooks: List[WebhookConfig] = []
-        self._history: List[Dict] = []
-        self._lock = threading.Lock()
+        # event_type -> [(index, webhook)], rebuilt whenever webhooks change
+        self._event_index: Dict[str, List[Tuple[int, WebhookConfig]]] = {}
+        # event_type -> (expires_at, enabled matching webhooks); cleared on change
+        self._match_cache: Dict[str, Tuple[float, Tuple[Tuple[int, WebhookConfig], ...]]] = {}
+        # Keyed HMAC-SHA256 contexts per secret, copied for each signature
+        self._hmac_templates: Dict[str, hmac.HMAC] = {}
+        self._history: deque = deque(maxlen=self.MAX_HISTORY)
+        # History entries not yet appended to the log, and whether the log
+        # must be rewritten from self._history (after clear/migration)
+        self._pending_history: List[Dict] = []
+        # Event digest -> (first seen, history entry) for deduplication
+        self._recent_events: Dict[bytes, Tuple[float, Dict]] = {}
+        self._history_rewrite = False
+        self._history_lines = 0
+        # Separate locks so history appends and delivery bookkeeping don't
+        # contend with webhook configuration reads
+        self._webhooks_lock = threading.RLock()
+        self._history_lock = threading.Lock()
+        self._delivery_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        # Delivery/persistence counters, guarded by _delivery_lock
+        self._metrics: Dict[str, int] = {"fire_ok": 0, "fire_fail": 0, "save_fail": 0}
+        self._failures_by_url: Counter = Counter()
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="webhook"
+        )
+        self._http = self._create_session(max_workers)
+
+        # Config/history writes are coalesced by a background flusher
+        self._config_dirty = threading.Event()
+        self._delivery_dirty = threading.Event()
+        self._history_dirty = threading.Event()
+        self._flush_wakeup = threading.Event()
+        self._closed = threading.Event()
 
         self._load_config()
         self._load_history()
 
+        self._flusher = threading.Thread(
+            target=self._flush_loop, name="notification-flusher", daemon=True
+        )
+        self._flusher.start()
+
+    def close(self):
+        """Stop accepting webhook deliveries and flush pending writes.
+
+        Waits for deliveries already in flight to finish before closing the
+        HTTP session they use. notify() returns no futures afterwards.
+        """
+        self._closed.set()
+        self._executor.shutdown(wait=True)
+        self._http.close()
+        self._flush_wakeup.set()
+        self._flusher.join(timeout=5)
+        self.flush()
+
+    @staticmethod
+    def _create_session(pool_size: int) -> requests.Session:
+        """Create an HTTP session with keep-alive connection pooling.
+
+        Reusing connections avoids a TCP/TLS handshake for every event sent
+        to the same endpoint.
+
+        Args:
+            pool_size: Maximum connections kept per host.
+        """
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=2, backoff_factor=0.2),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    def flush(self, include_delivery: bool = True):
+        """Write any pending config/history changes to disk now.
+
+        Args:
+            include_delivery: Also write pending delivery bookkeeping.
+        """
+        delivery_pending = include_delivery and self._delivery_dirty.is_set()
+        if self._config_dirty.is_set() or delivery_pending:
+            self._config_dirty.clear()
+            self._delivery_dirty.clear()
+            self._save_config()
+        if self._history_dirty.is_set():
+            self._history_dirty.clear()
+            self._save_history()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
     def add_webhook(self, url: str, name: str = "", events: List[str] = None,
-                    secret: str = "") -> WebhookConfig:
+                    secret: str = "", format: str = "json") -> WebhookConfig:
         """Add a new webhook endpoint.
 
         Args:
@@ -86,6 +231,7 @@ class NotificationManager:
             name: Human-readable name for this webhook.
             events: List of event types to subscribe to.
             secret: Optional secret for webhook signature verification.
+            format: Payload wire format, a key of PAYLOAD_FORMATS.
 
         Returns:
             The created WebhookConfig.
@@ -95,12 +241,14 @@ class NotificationManager:
             name=name or url[:30],
             events=events or ["sync_complete"],
             secret=secret,
+            format=format if format in PAYLOAD_FORMATS else "json",
         )
 
-        with self._lock:
+        with self._webhooks_lock:
             self._webhooks.append(webhook)
+            self._rebuild_index()
 
-        self._save_config()
+        self._mark_config_dirty()
         return webhook
 
     def remove_webhook(self, index: int) -> bool:
@@ -112,10 +260,11 @@ class NotificationManager:
         Returns:
             True if removed successfully.
         """
-        with self._lock:
+        with self._webhooks_lock:
             if 0 <= index < len(self._webhooks):
                 self._webhooks.pop(index)
-                self._save_config()
+                self._rebuild_index()
+                self._mark_config_dirty()
                 return True
         return False
 
@@ -131,19 +280,23 @@ class NotificationManager:
         Returns:
             True if updated successfully.
         """
-        with self._lock:
+        with self._webhooks_lock:
             if 0 <= index < len(self._webhooks):
                 if enabled is not None:
                     self._webhooks[index].enabled = enabled
+                    if enabled:
+                        # Manually re-enabling closes the circuit breaker
+                        self._webhooks[index].cooldown_until = 0.0
                 if events is not None:
                     self._webhooks[index].events = events
-                self._save_config()
+                self._rebuild_index()
+                self._mark_config_dirty()
                 return True
         return False
 
     def get_webhooks(self) -> List[WebhookConfig]:
         """Get all configured webhooks."""
-        with self._lock:
+        with self._webhooks_lock:
             return list(self._webhooks)
 
     def get_history(self, limit: int = 50) -> List[Dict]:
@@ -155,24 +308,36 @@ class NotificationManager:
         Returns:
             List of notification history dicts, most recent first.
         """
-        with self._lock:
-            return list(reversed(self._history[-limit:]))
+        with self._history_lock:
+            return list(islice(reversed(self._history), limit))
 
     def clear_history(self):
         """Clear all notification history."""
-        with self._lock:
-            self._history = []
-        self._save_history()
-
-    def notify(self, event: NotificationEvent):
+        with self._history_lock:
+            self._history.clear()
+            self._pending_history = []
+            self._recent_events.clear()
+            self._history_rewrite = True
+        self._mark_history_dirty()
+
+    def notify(self, event: NotificationEvent) -> List[Future]:
         """Fire a notification event.
 
-        Sends webhooks to all matching endpoints in background threads.
-        Also records the event in history.
+        Sends webhooks to all matching endpoints concurrently on the worker
+        pool. Also records the event in history. An event identical to one
+        fired within DEDUPE_WINDOW seconds only increments the "duplicates"
+        count of the original history entry.
 
         Args:
             event: The NotificationEvent to fire.
+
+        Returns:
+            One Future per webhook delivery; callers that need to know when
+            the fan-out has finished can pass them to concurrent.futures.wait().
         """
+        if self._closed.is_set():
+            return []
+
         # Record in history
         history_entry = {
             "event_type": event.event_type,
@@ -181,117 +346,253 @@ class NotificationManager:
             "message": event.message,
             "timestamp": event.timestamp,
             "webhooks_fired": 0,
+            "duplicates": 0,
         }
+        if not self._claim_event(event, history_entry):
+            return []
 
-        # Find matching webhooks
-        with self._lock:
-            matching = [
-                (i, wh) for i, wh in enumerate(self._webhooks)
-                if wh.enabled and event.event_type in wh.events
-            ]
+        matching = self._get_matching(event.event_type)
+
+        # Encode the payload once per wire format and sign it once per
+        # (format, secret), however many webhooks share them
+        event_dict = {
+            "event_type": event.event_type,
+            "account_name": event.account_name,
+            "title": event.title,
+            "message": event.message,
+            "timestamp": event.timestamp,
+            "data": event.data,
+        }
+        encoded: Dict[str, bytes] = {}
+        signatures: Dict[Tuple[str, str], str] = {}
 
-        # Fire webhooks in background threads
+        # Fire webhooks on the shared worker pool
+        futures = []
+        now = time.time()
         for idx, webhook in matching:
-            history_entry["webhooks_fired"] += 1
-            thread = threading.Thread(
-                target=self._fire_webhook,
-                args=(webhook, event, idx),
-                daemon=True
-            )
-            thread.start()
+            if webhook.cooldown_until > now:
+                continue  # circuit open: endpoint has been failing
+            fmt = "msgpack" if webhook.format == "msgpack" and _MSGPACK_ENCODER else "json"
+            payload = encoded.get(fmt)
+            if payload is None:
+                if fmt == "msgpack":
+                    payload = _MSGPACK_ENCODER.encode(event_dict)
+                else:
+                    payload = jsonio.dumps(event_dict)
+                encoded[fmt] = payload
+
+            headers = _BASE_HEADERS[fmt]
+            if webhook.secret:
+                key = (fmt, webhook.secret)
+                if key not in signatures:
+                    signatures[key] = self._sign(webhook.secret, payload)
+                headers = headers.copy()
+                headers["X-Webhook-Signature"] = f"sha256={signatures[key]}"
+
+            try:
+                future = self._executor.submit(self._fire_webhook, webhook, payload, headers)
+            except RuntimeError:
+                break  # close() shut the pool down while this event fanned out
+            future.add_done_callback(self._log_delivery_error)
+            futures.append(future)
+        history_entry["webhooks_fired"] = len(futures)
 
         # Save to history
-        with self._lock:
+        with self._history_lock:
             self._history.append(history_entry)
-            if len(self._history) > self.MAX_HISTORY:
-                self._history = self._history[-self.MAX_HISTORY:]
+            self._pending_history.append(history_entry)
 
-        self._save_history()
+        self._mark_history_dirty()
+        return futures
+
+    @staticmethod
+    def _event_digest(event: NotificationEvent) -> bytes:
+        """Hash the fields that identify a repeated notification."""
+        key = jsonio.dumps([event.event_type, event.account_name, event.title, event.message])
+        return hashlib.blake2b(key, digest_size=16).digest()
+
+    def _claim_event(self, event: NotificationEvent, history_entry: Dict) -> bool:
+        """Record an event for deduplication unless it is a duplicate.
+
+        The lookup and the insert happen under one lock, so of several
+        identical events fired concurrently exactly one is delivered.
+        Expired entries are pruned first; a duplicate bumps the original
+        history entry's "duplicates" count.
+
+        Returns:
+            True if the event should be delivered, False if an identical
+            one was fired within DEDUPE_WINDOW.
+        """
+        if event.event_type in self.DEDUPE_EXCLUDED_EVENTS:
+            return True
+
+        now = time.monotonic()
+        with self._history_lock:
+            # Entries are inserted in time order, so expired ones lead
+            while self._recent_events:
+                oldest = next(iter(self._recent_events))
+                if self._recent_events[oldest][0] > now - self.DEDUPE_WINDOW:
+                    break
+                del self._recent_events[oldest]
+
+            digest = self._event_digest(event)
+            recent = self._recent_events.get(digest)
+            if recent is None:
+                self._recent_events[digest] = (now, history_entry)
+                return True
+            recent[1]["duplicates"] += 1
+            return False
 
-    def _fire_webhook(self, webhook: WebhookConfig, event: NotificationEvent,
-                      webhook_index: int):
+    def _fire_webhook(self, webhook: WebhookConfig, payload: bytes,
+                      headers: Dict[str, str]):
         """Send a POST request to a webhook URL.
 
         Args:
             webhook: The webhook configuration.
-            event: The event to send.
-            webhook_index: Index for updating failure count.
+            payload: The encoded event payload.
+            headers: Request headers, including any signature.
         """
-        payload = json.dumps({
-            "event_type": event.event_type,
-            "account_name": event.account_name,
-            "title": event.title,
-            "message": event.message,
-            "timestamp": event.timestamp,
-            "data": event.data,
-        }).encode("utf-8")
-
-        headers = {
-            "Content-Type": "application/json",
-            "User-Agent": "GmailOrganizer/1.0",
-        }
-
-        if webhook.secret:
-            import hashlib
-            import hmac
-            signature = hmac.new(
-                webhook.secret.encode("utf-8"),
-                payload,
-                hashlib.sha256
-            ).hexdigest()
-            headers["X-Webhook-Signature"] = f"sha256={signature}"
-
         try:
-            req = urllib.request.Request(
-                webhook.url,
-                data=payload,
-                headers=headers,
-                method="POST"
-            )
-            with urllib.request.urlopen(req, timeout=10) as response:
-                pass  # Success
+            response = self._http.post(webhook.url, data=payload, headers=headers, timeout=10)
+            response.raise_for_status()
+
+            with self._delivery_lock:
+                webhook.last_triggered = _utc_isoformat(time.time_ns())
+                webhook.failure_count = 0
+                webhook.cooldown_until = 0.0
+                self._metrics["fire_ok"] += 1
+            self._delivery_dirty.set()
+
+        except requests.RequestException as e:
+            logger.debug(f"Webhook delivery to {webhook.url} failed: {e}")
+            with self._delivery_lock:
+                self._metrics["fire_fail"] += 1
+                self._failures_by_url[webhook.url] += 1
+                webhook.failure_count += 1
+                if webhook.failure_count >= self.FAILURE_THRESHOLD:
+                    backoff = min(2 ** webhook.failure_count, self.MAX_COOLDOWN)
+                    webhook.cooldown_until = time.time() + backoff
+            self._delivery_dirty.set()
+
+    @staticmethod
+    def _log_delivery_error(future: Future):
+        """Log unexpected errors raised by a webhook delivery task.
+
+        Network failures are handled inside _fire_webhook(); anything that
+        reaches here is a bug and would otherwise vanish inside the Future.
+        """
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error("Unexpected error delivering webhook", exc_info=error)
 
-            with self._lock:
-                if webhook_index < len(self._webhooks):
-                    self._webhooks[webhook_index].last_triggered = datetime.now().isoformat()
-                    self._webhooks[webhook_index].failure_count = 0
-            self._save_config()
+    def _sign(self, secret: str, payload: bytes) -> str:
+        """Compute the hex HMAC-SHA256 signature of a payload.
 
-        except (urllib.error.URLError, urllib.error.HTTPError, Exception):
-            with self._lock:
-                if webhook_index < len(self._webhooks):
-                    self._webhooks[webhook_index].failure_count += 1
-            self._save_config()
+        The keyed HMAC context is built once per secret and copied for each
+        payload, skipping secret encoding and key setup on every event.
+        """
+        template = self._hmac_templates.get(secret)
+        if template is None:
+            template = hmac.new(secret.encode("utf-8"), digestmod=hashlib.sha256)
+            self._hmac_templates[secret] = template
+        mac = template.copy()
+        mac.update(payload)
+        return mac.hexdigest()
 
     def get_stats(self) -> Dict:
         """Get notification system statistics.
 
         Returns:
             Dict with webhook_count, enabled_count, total_notifications,
-            and recent_failures.
+            recent_failures, delivery/persistence counters (fire_ok,
+            fire_fail, save_fail) and failures_by_url.
         """
-        with self._lock:
+        with self._webhooks_lock:
+            webhook_count = len(self._webhooks)
             enabled = sum(1 for w in self._webhooks if w.enabled)
             failures = sum(w.failure_count for w in self._webhooks)
+        with self._history_lock:
+            total_notifications = len(self._history)
+        with self._delivery_lock:
+            metrics = dict(self._metrics)
+            failures_by_url = dict(self._failures_by_url)
+
+        return {
+            "webhook_count": webhook_count,
+            "enabled_count": enabled,
+            "total_notifications": total_notifications,
+            "recent_failures": failures,
+            **metrics,
+            "failures_by_url": failures_by_url,
+        }
 
-            return {
-                "webhook_count": len(self._webhooks),
-                "enabled_count": enabled,
-                "total_notifications": len(self._history),
-                "recent_failures": failures,
-            }
+    def _get_matching(self, event_type: str) -> Tuple[Tuple[int, WebhookConfig], ...]:
+        """Get the enabled webhooks subscribed to an event type.
+
+        Results are cached for WEBHOOK_CACHE_TTL seconds so bursts of events
+        don't contend on the webhooks lock; the cache is cleared whenever webhooks change.
+        """
+        now = time.monotonic()
+        cached = self._match_cache.get(event_type)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+
+        with self._webhooks_lock:
+            matching = tuple(
+                (i, wh) for i, wh in self._event_index.get(event_type, ())
+                if wh.enabled
+            )
+            self._match_cache[event_type] = (now + WEBHOOK_CACHE_TTL, matching)
+        return matching
+
+    def _rebuild_index(self):
+        """Rebuild the event_type -> webhooks index. Caller holds _webhooks_lock."""
+        index: Dict[str, List[Tuple[int, WebhookConfig]]] = {}
+        for i, wh in enumerate(self._webhooks):
+            for event_type in wh.events:
+                index.setdefault(event_type, []).append((i, wh))
+        self._event_index = index
+        self._match_cache.clear()
+        self._hmac_templates.clear()
+
+    def _mark_config_dirty(self):
+        """Schedule the webhook configuration to be written by the flusher."""
+        self._config_dirty.set()
+        self._flush_wakeup.set()
+
+    def _mark_history_dirty(self):
+        """Schedule the notification history to be written by the flusher."""
+        self._history_dirty.set()
+        self._flush_wakeup.set()
+
+    def _flush_loop(self):
+        """Background loop that writes dirty state at most once per interval.
+
+        Config/history changes wake the loop and are written after
+        FLUSH_INTERVAL; delivery bookkeeping is written on the periodic
+        DELIVERY_FLUSH_INTERVAL pass or together with a config change.
+        """
+        while not self._closed.is_set():
+            woken = self._flush_wakeup.wait(self.DELIVERY_FLUSH_INTERVAL)
+            if woken:
+                # Let further changes accumulate before writing
+                self._closed.wait(self.FLUSH_INTERVAL)
+                self._flush_wakeup.clear()
+            self.flush(include_delivery=not woken)
 
     def _save_config(self):
         """Save webhook configuration to disk."""
         config_path = self._config_dir / self.CONFIG_FILE
-        with self._lock:
-            data = [asdict(wh) for wh in self._webhooks]
+        with self._webhooks_lock:
+            data = jsonio.dumps(self._webhooks)
 
         try:
-            with open(config_path, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            pass
+            jsonio.atomic_write_bytes(config_path, data)
+        except OSError as e:
+            self._count_save_failure()
+            logger.warning(f"Failed to save notification config: {e}")
 
     def _load_config(self):
         """Load webhook configuration from disk."""
@@ -300,35 +601,86 @@ class NotificationManager:
             return
 
         try:
-            with open(config_path, "r") as f:
-                data = json.load(f)
-            with self._lock:
+            data = jsonio.loads(config_path.read_bytes())
+            with self._webhooks_lock:
                 self._webhooks = [WebhookConfig(**item) for item in data]
-        except Exception:
-            pass
+                self._rebuild_index()
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Failed to load notification config: {e}")
 
     def _save_history(self):
-        """Save notification history to disk."""
+        """Append pending history entries to the on-disk log.
+
+        The log is compacted (rewritten from the in-memory history via an
+        atomic replace) once it grows past twice MAX_HISTORY lines, or after
+        the history was cleared. Appends reopen the log on every flush, so
+        they always reach the current file rather than one a compaction has
+        replaced. Compaction keeps only this manager's history, so one
+        manager should own a config directory per process.
+        """
         history_path = self._config_dir / self.HISTORY_FILE
-        with self._lock:
-            data = list(self._history)
-
-        try:
-            with open(history_path, "w") as f:
-                json.dump(data, f, indent=2)
-        except Exception:
-            pass
+        with self._history_lock:
+            pending = self._pending_history
+            self._pending_history = []
+            rewrite = self._history_rewrite
+            self._history_rewrite = False
+            entries = list(self._history)
+
+        with self._file_lock:
+            if self._history_lines + len(pending) > 2 * self.MAX_HISTORY:
+                rewrite = True
+            try:
+                if rewrite:
+                    jsonio.atomic_write_bytes(
+                        history_path, b"".join(jsonio.dumps(e) + b"\n" for e in entries)
+                    )
+                    self._history_lines = len(entries)
+                    (self._config_dir / self.LEGACY_HISTORY_FILE).unlink(missing_ok=True)
+                elif pending:
+                    with open(history_path, "ab") as f:
+                        f.write(b"".join(jsonio.dumps(e) + b"\n" for e in pending))
+                    self._history_lines += len(pending)
+            except OSError as e:
+                self._count_save_failure()
+                logger.warning(f"Failed to save notification history: {e}")
+
+    def _count_save_failure(self):
+        """Increment the save_fail counter."""
+        with self._delivery_lock:
+            self._metrics["save_fail"] += 1
 
     def _load_history(self):
-        """Load notification history from disk."""
+        """Load the most recent notification history entries from disk.
+
+        Falls back to the legacy JSON-array history file, which is migrated
+        to the append-only log on the next flush.
+        """
         history_path = self._config_dir / self.HISTORY_FILE
-        if not history_path.exists():
-            return
+        legacy_path = self._config_dir / self.LEGACY_HISTORY_FILE
 
         try:
-            with open(history_path, "r") as f:
-                data = json.load(f)
-            with self._lock:
-                self._history = data[-self.MAX_HISTORY:]
-        except Exception:
-            pass
+            if history_path.exists():
+                lines = history_path.read_bytes().splitlines()
+                data = []
+                # Scan from the end, keeping the newest MAX_HISTORY valid entries
+                for line in reversed(lines):
+                    try:
+                        data.append(jsonio.loads(line))
+                    except ValueError:
+                        continue  # torn trailing write from a crash
+                    if len(data) == self.MAX_HISTORY:
+                        break
+                data.reverse()
+                self._history_lines = len(lines)
+            elif legacy_path.exists():
+                data = jsonio.loads(legacy_path.read_bytes())
+                self._history_rewrite = True
+                self._history_dirty.set()
+                self._flush_wakeup.set()
+            else:
+                return
+
+            with self._history_lock:
+                self._history = deque(data[-self.MAX_HISTORY:], maxlen=self.MAX_HISTORY)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load notification history: {e}")
@@ -1,118 +1,319 @@
 """Gmail API operations for fetching and organizing emails"""
 
-import base64
-import json
+import binascii
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Optional
+from types import MappingProxyType
+from typing import Iterator, List, Dict, Mapping, Optional
 from googleapiclient.errors import HttpError
 from googleapiclient.http import BatchHttpRequest
 from email.mime.text import MIMEText
-from .config import CATEGORIES, BATCH_SIZE
+from .config import CATEGORIES, BATCH_SIZE, FETCH_BODY_PREVIEW, FETCH_MESSAGES_PER_MINUTE, FETCH_WORKERS
+from . import jsonio
+from .logger import logger
 import time
 
+# Characters replaced to build file-system-safe account and query names
+_EMAIL_SAFE_CHARS = str.maketrans({'@': '_at_', '.': '_'})
+_QUERY_SAFE_CHARS = str.maketrans({':': '_', ' ': '_', '/': '_'})
+# base64url alphabet -> standard base64 alphabet
+_BASE64URL_CHARS = str.maketrans('-_', '+/')
+
+# Simplified mapping - Gmail has specific color palette
+_GMAIL_LABEL_COLORS = MappingProxyType({
+    "#fb4c2f": MappingProxyType({"backgroundColor": "#fb4c2f", "textColor": "#ffffff"}),  # Red
+    "#fad165": MappingProxyType({"backgroundColor": "#fad165", "textColor": "#000000"}),  # Yellow
+    "#16a766": MappingProxyType({"backgroundColor": "#16a766", "textColor": "#ffffff"}),  # Green
+    "#7bd148": MappingProxyType({"backgroundColor": "#7bd148", "textColor": "#ffffff"}),  # Bright green
+    "#b99aff": MappingProxyType({"backgroundColor": "#b99aff", "textColor": "#000000"}),  # Purple
+    "#ff7537": MappingProxyType({"backgroundColor": "#ff7537", "textColor": "#ffffff"}),  # Orange
+})
+_DEFAULT_LABEL_COLOR = MappingProxyType({"backgroundColor": "#cccccc", "textColor": "#000000"})
+
+# (category_key, label_name, color) for every category, flattened once
+_FLAT_CATEGORIES = tuple(
+    (category_key, category_info['name'], category_info.get('color'))
+    for group in CATEGORIES.values()
+    for category_key, category_info in group.items()
+)
+
+# HttpError reasons Gmail reports (alongside 403) when a rate limit is hit
+_RATE_LIMIT_REASONS = frozenset({'rateLimitExceeded', 'userRateLimitExceeded', 'quotaExceeded'})
+
+
+def _is_rate_limit_error(error: HttpError) -> bool:
+    """Check whether an HttpError is a rate-limit response.
+
+    Uses the status code and the structured error details the client has
+    already parsed, instead of formatting the error as a string.
+    """
+    status = error.resp.status
+    if status == 429:
+        return True
+    if status != 403 or not isinstance(error.error_details, list):
+        return False
+    return any(isinstance(detail, dict) and detail.get('reason') in _RATE_LIMIT_REASONS
+               for detail in error.error_details)
+
+
+class _TokenBucket:
+    """Thread-safe token bucket pacing API requests across worker threads
+
+    The rate adapts to the server: backoff() halves it after a rate-limit
+    response (down to 1/16 of the configured rate) and recover() steps it
+    back up after successful requests.
+    """
+
+    # Lowest rate backoff() can reach, as a fraction of the configured rate
+    MIN_RATE_FRACTION = 1 / 16
+
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.base_interval = 60.0 / rate_per_minute
+        self.interval = self.base_interval
+        self.capacity = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        """Block until enough tokens are available, then take them"""
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) / self.interval)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_time = (tokens - self._tokens) * self.interval
+            time.sleep(wait_time)
+
+    def backoff(self):
+        """Halve the rate after the server reported a rate limit"""
+        with self._lock:
+            self.interval = min(self.interval * 2, self.base_interval / self.MIN_RATE_FRACTION)
+
+    def recover(self):
+        """Step the rate back toward the configured rate after a success"""
+        if self.interval > self.base_interval:
+            with self._lock:
+                self.interval = max(self.base_interval, self.interval * 0.8)
+
 
 class GmailOperations:
     """Handle Gmail operations like fetching emails, creating labels, and filters"""
 
-    def __init__(self, service, account_email):
+    # Concurrent batch requests while fetching, and their shared message rate
+    # (Gmail allows 15,000 quota units/min; messages.get costs 5 = 3,000/min)
+    FETCH_WORKERS = FETCH_WORKERS
+    MESSAGES_PER_MINUTE = FETCH_MESSAGES_PER_MINUTE
+    # Messages per batch request: smaller for format=full so one slow,
+    # oversized response holds up fewer messages
+    FULL_BATCH_SIZE = 25
+    METADATA_BATCH_SIZE = 50
+    # Headers read from each message when bodies are not fetched
+    METADATA_HEADERS = ['Subject', 'From', 'To', 'Date', 'List-Unsubscribe']
+    # Lowercased header name -> email dict field, matched in one pass
+    HEADER_FIELDS = {'subject': 'subject', 'from': 'sender', 'to': 'to', 'date': 'date'}
+    # Lowercased header name -> key in the email's 'headers' dict, kept only when present
+    RAW_HEADERS = {'list-unsubscribe': 'List-Unsubscribe'}
+    # History records per history.list page (API default 100, max 500)
+    HISTORY_PAGE_SIZE = 500
+    # Partial-response field masks: only the fields the parsers read
+    FULL_MESSAGE_FIELDS = 'id,historyId,labelIds,snippet,payload'
+    METADATA_MESSAGE_FIELDS = 'id,historyId,labelIds,snippet,payload/headers'
+    HISTORY_FIELDS = (
+        'history(messagesAdded/message/id,messagesDeleted/message/id,'
+        'labelsAdded(message/id,labelIds),labelsRemoved(message/id,labelIds)),'
+        'historyId,nextPageToken'
+    )
+    # Label creations sent per batch request
+    LABEL_BATCH_SIZE = 50
+    # Labels applied concurrently by apply_labels_parallel
+    LABEL_WORKERS = 4
+    # Seconds the on-disk label name -> ID cache is trusted before re-listing
+    LABELS_CACHE_TTL_SECONDS = 3600
+    # Seconds a getProfile message total is reused by get_email_count
+    PROFILE_TTL_SECONDS = 60
+    # Seconds a per-query resultSizeEstimate is reused by get_email_count
+    COUNT_TTL_SECONDS = 30
+
+    def __init__(self, service, account_email, fetch_body_preview: bool = FETCH_BODY_PREVIEW):
         self.service = service
         self.account_email = account_email
-        self.labels_cache = None
+        # Full bodies are only downloaded when body_preview is wanted
+        self.fetch_body_preview = fetch_body_preview
+        # Label name -> ID, listed once and updated as labels are created
+        self._labels_by_name: Optional[Dict[str, str]] = None
         self.checkpoint_dir = Path(__file__).parent.parent / ".email-cache"
         self.checkpoint_dir.mkdir(exist_ok=True)
         self.sync_state_dir = Path(__file__).parent.parent / ".sync-state"
         self.sync_state_dir.mkdir(exist_ok=True)
+        self._safe_email = account_email.translate(_EMAIL_SAFE_CHARS)
+        self._checkpoint_paths: Dict[str, Path] = {}
+        # Number of emails already persisted to batch files, per checkpoint dir
+        self._checkpoint_written_count: Dict[Path, int] = {}
+        self._batch_manifests: Dict[Path, List[List]] = {}
+        # The service's own authorized connection, kept alive across calls on
+        # the creating thread; other threads get their own (see _get_thread_http)
+        self._http = getattr(service, '_http', None)
+        self._thread_local = threading.local()
+        self._thread_local.http = self._http
+        # Highest message historyId seen in batch responses (any worker thread)
+        self._max_history_id = 0
+        self._history_id_lock = threading.Lock()
+        # (monotonic fetch time, messagesTotal) from the last getProfile call
+        self._profile_cache: Optional[tuple] = None
+        # Query -> (monotonic fetch time, resultSizeEstimate)
+        self._count_cache: Dict[str, tuple] = {}
 
     def _get_checkpoint_path(self, query: str) -> Path:
-        """Get checkpoint directory path for a specific query"""
-        safe_query = query.replace(':', '_').replace(' ', '_').replace('/', '_') if query else 'all'
-        safe_email = self.account_email.replace('@', '_at_').replace('.', '_')
-        checkpoint_subdir = self.checkpoint_dir / f"{safe_email}_{safe_query}"
-        checkpoint_subdir.mkdir(exist_ok=True)
+        """Get checkpoint directory path for a specific query (created on first use)"""
+        checkpoint_subdir = self._checkpoint_paths.get(query)
+        if checkpoint_subdir is None:
+            safe_query = query.translate(_QUERY_SAFE_CHARS) if query else 'all'
+            checkpoint_subdir = self.checkpoint_dir / f"{self._safe_email}_{safe_query}"
+            checkpoint_subdir.mkdir(exist_ok=True)
+            self._checkpoint_paths[query] = checkpoint_subdir
         return checkpoint_subdir
 
     def _load_checkpoint(self, checkpoint_path: Path) -> Dict:
         """Load existing checkpoint from directory-based storage"""
-        from gmail_organizer.logger import logger
 
-        emails = []
-        fetched_ids = set()
+        emails: Dict[str, Dict] = {}
 
         if not checkpoint_path.exists():
-            return {"emails": emails, "fetched_ids": fetched_ids}
+            return {"emails": emails}
 
-        # Load index file (tracks fetched IDs)
-        index_file = checkpoint_path / "index.json"
-        if index_file.exists():
-            try:
-                with open(index_file, 'r') as f:
-                    fetched_ids = set(json.load(f))
-            except Exception as e:
-                logger.warning(f"Could not load checkpoint index: {e}")
+        # The ID log is only needed for quick counts; convert any legacy index
+        self._migrate_checkpoint_index(checkpoint_path)
 
-        # Load email data from batch files
-        batch_files = sorted(checkpoint_path.glob("batch_*.jsonl"))
-        for batch_file in batch_files:
+        # Load email data from batch files, keyed by email ID
+        for batch_name, _ in self._get_batch_manifest(checkpoint_path):
+            batch_file = checkpoint_path / batch_name
             try:
-                with open(batch_file, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            emails.append(json.loads(line))
+                for email in jsonio.iter_jsonl(batch_file):
+                    emails[email['email_id']] = email
             except Exception as e:
                 logger.warning(f"Could not load batch file {batch_file}: {e}")
 
+        # Everything loaded here is already on disk; later saves append after it
+        self._checkpoint_written_count[checkpoint_path] = len(emails)
+
         if emails:
             logger.info(f"📂 Loaded checkpoint: {len(emails)} emails already fetched")
 
-        return {"emails": emails, "fetched_ids": fetched_ids}
+        return {"emails": emails}
 
-    def _save_checkpoint(self, checkpoint_path: Path, emails: List[Dict], fetched_ids: set):
-        """Save progress using append-only batch files (efficient for large datasets)"""
-        from gmail_organizer.logger import logger
+    def _save_checkpoint(self, checkpoint_path: Path, emails: Dict[str, Dict]):
+        """Save progress using append-only batch files (efficient for large datasets)
+
+        Args:
+            checkpoint_path: Checkpoint directory
+            emails: All fetched emails keyed by ID, in fetch order
+        """
 
         try:
             checkpoint_path.mkdir(exist_ok=True)
 
-            # Save index (fetched IDs) - small file, fast to write
-            index_file = checkpoint_path / "index.json"
-            with open(index_file, 'w') as f:
-                json.dump(list(fetched_ids), f)
-
-            # Determine which emails haven't been written to batch files yet
-            existing_count = 0
-            batch_files = sorted(checkpoint_path.glob("batch_*.jsonl"))
-            for bf in batch_files:
-                with open(bf, 'r') as f:
-                    existing_count += sum(1 for line in f if line.strip())
-
-            # Append new emails to a new batch file
-            new_emails = emails[existing_count:]
+            # Determine which emails haven't been written to batch files yet.
+            # The count is tracked in memory; the manifest supplies it when
+            # saving to a checkpoint that was never loaded this session.
+            manifest = self._get_batch_manifest(checkpoint_path)
+            existing_count = self._checkpoint_written_count.get(checkpoint_path)
+            if existing_count is None:
+                existing_count = sum(line_count for _, line_count in manifest)
+
+            # Append new emails to a new batch file and record it in the
+            # manifest, then log their IDs. IDs go last so an interrupted
+            # save never marks unsaved emails as fetched. New emails are the
+            # tail of the dict, taken from the end so each save costs
+            # O(new emails) rather than skipping over everything saved before.
+            new_count = len(emails) - existing_count
+            new_emails = list(islice(reversed(emails.values()), max(new_count, 0)))[::-1]
             if new_emails:
-                batch_num = len(batch_files)
-                batch_file = checkpoint_path / f"batch_{batch_num:04d}.jsonl"
-                with open(batch_file, 'w') as f:
-                    for email in new_emails:
-                        f.write(json.dumps(email) + '\n')
+                batch_name = f"batch_{len(manifest):04d}{jsonio.JSONL_SUFFIX}"
+                jsonio.write_jsonl(checkpoint_path / batch_name, new_emails)
+                manifest.append([batch_name, len(new_emails)])
+                jsonio.atomic_write_bytes(checkpoint_path / "manifest.json", jsonio.dumps(manifest))
+                with open(checkpoint_path / "ids.txt", 'a') as f:
+                    f.write('\n'.join(email['email_id'] for email in new_emails) + '\n')
+            self._checkpoint_written_count[checkpoint_path] = len(emails)
 
         except Exception as e:
             logger.warning(f"Could not save checkpoint: {e}")
 
+    def _get_batch_manifest(self, checkpoint_path: Path) -> List[List]:
+        """
+        Get the [batch file name, email count] list for a checkpoint, in order.
+
+        Kept in memory and in manifest.json so batch files are only
+        enumerated once, for checkpoints written before the manifest existed.
+        """
+        manifest = self._batch_manifests.get(checkpoint_path)
+        if manifest is not None:
+            return manifest
+
+        manifest_file = checkpoint_path / "manifest.json"
+        try:
+            manifest = jsonio.loads(manifest_file.read_bytes())
+        except (OSError, ValueError):
+            manifest = [
+                [batch_file.name, jsonio.count_lines(batch_file)]
+                for batch_file in sorted(
+                    [*checkpoint_path.glob("batch_*.jsonl"), *checkpoint_path.glob("batch_*.jsonl.zst")]
+                )
+            ]
+            if manifest:
+                jsonio.atomic_write_bytes(manifest_file, jsonio.dumps(manifest))
+
+        self._batch_manifests[checkpoint_path] = manifest
+        return manifest
+
+    def _migrate_checkpoint_index(self, checkpoint_path: Path):
+        """Convert a legacy index.json (JSON list of IDs) into the ids.txt log"""
+        index_file = checkpoint_path / "index.json"
+        if not index_file.exists() or (checkpoint_path / "ids.txt").exists():
+            return
+
+        try:
+            ids = jsonio.loads(index_file.read_bytes())
+            data = ''.join(f"{email_id}\n" for email_id in ids).encode('utf-8')
+            jsonio.atomic_write_bytes(checkpoint_path / "ids.txt", data)
+            index_file.unlink()
+            logger.info(f"Migrated checkpoint index to ids.txt: {len(ids)} IDs")
+        except Exception as e:
+            logger.warning(f"Could not migrate checkpoint index: {e}")
+
     # ==================== SYNC STATE MANAGEMENT ====================
     # These methods manage the historyId for incremental sync using Gmail's History API
 
     def _get_sync_state_path(self) -> Path:
         """Get sync state file path for this account"""
-        safe_email = self.account_email.replace('@', '_at_').replace('.', '_')
-        return self.sync_state_dir / f"sync_state_{safe_email}.json"
+        return self.sync_state_dir / f"sync_state_{self._safe_email}.json"
+
+    def _get_labels_cache_path(self) -> Path:
+        """Get the on-disk label name -> ID cache path for this account"""
+        return self.sync_state_dir / f"labels_{self._safe_email}.json"
+
+    def _get_sync_journal_path(self) -> Path:
+        """Get the path of a legacy sync journal left by older versions"""
+        return self._get_sync_state_path().with_suffix(".journal.jsonl")
 
     def _load_sync_state(self) -> Dict:
         """Load sync state (historyId, last sync time, email database).
 
+        The sync state is a single JSON snapshot. Older versions could also
+        leave a JSONL journal of changes next to it; if one is found it is
+        replayed on top of the snapshot and folded in on the next save.
+
         Also checks the checkpoint directory - if it has more emails than
         the sync state (e.g., due to an interrupted sync), merges them in.
         """
-        from gmail_organizer.logger import logger
 
         state = {
             "history_id": None,
@@ -124,56 +325,63 @@ class GmailOperations:
         sync_path = self._get_sync_state_path()
         if sync_path.exists():
             try:
-                with open(sync_path, 'r') as f:
-                    state = json.load(f)
+                state = jsonio.loads(sync_path.read_bytes())
             except Exception as e:
                 logger.warning(f"Could not load sync state: {e}")
 
+        # Migrate a journal left by an older version
+        journal_path = self._get_sync_journal_path()
+        if journal_path.exists():
+            try:
+                self._replay_sync_journal(journal_path, state)
+            except Exception as e:
+                logger.warning(f"Could not fully replay sync journal: {e}")
+
         # Recovery: check if checkpoint has more data than sync state
         # This handles the case where a sync was interrupted before saving state
         checkpoint_path = self._get_checkpoint_path("")
         sync_emails_dict = state.get("emails", {})
 
-        # Quick check: compare index size (just IDs) before loading full checkpoint
-        index_file = checkpoint_path / "index.json"
+        # Quick check: compare ID log size before loading full checkpoint
+        self._migrate_checkpoint_index(checkpoint_path)
+        ids_file = checkpoint_path / "ids.txt"
         checkpoint_count = 0
-        if index_file.exists():
+        if ids_file.exists():
             try:
-                with open(index_file, 'r') as f:
-                    checkpoint_count = len(json.load(f))
+                checkpoint_count = jsonio.count_lines(ids_file)
             except Exception:
                 pass
 
         if checkpoint_count > len(sync_emails_dict):
             # Checkpoint has more data - load full checkpoint and merge
             checkpoint = self._load_checkpoint(checkpoint_path)
-            checkpoint_emails = checkpoint.get("emails", [])
+            checkpoint_emails = checkpoint.get("emails", {})
 
             logger.info(
                 f"Checkpoint has more emails ({len(checkpoint_emails)}) than sync state "
                 f"({len(sync_emails_dict)}), merging checkpoint data"
             )
-            # Merge: start with sync state, overlay with checkpoint data
-            merged = dict(sync_emails_dict)
-            for email in checkpoint_emails:
-                email_id = email.get("email_id", "")
-                if email_id:
-                    merged[email_id] = email
-            state["emails"] = merged
-            state["total_synced"] = len(merged)
+            # Merge: overlay checkpoint data on the sync state
+            sync_emails_dict.update(checkpoint_emails)
+            state["emails"] = sync_emails_dict
+            state["total_synced"] = len(sync_emails_dict)
             # Save the merged state so we don't have to merge again next time
             self._save_sync_state(
                 state.get("history_id") or "",
-                merged,
+                sync_emails_dict,
                 state.get("last_sync_time")
             )
 
         return state
 
     def _save_sync_state(self, history_id: str, emails: Dict, last_sync_time: str = None):
-        """Save sync state after successful sync"""
-        from datetime import datetime
-        from gmail_organizer.logger import logger
+        """Save sync state after successful sync
+
+        The snapshot is the on-disk contract with the macOS helper, which
+        decodes it directly as JSON, so it stays a single JSON document and
+        is rewritten in full after every sync. Any legacy journal is folded
+        into it and removed.
+        """
 
         sync_path = self._get_sync_state_path()
         try:
@@ -183,19 +391,35 @@ class GmailOperations:
                 "emails": emails,
                 "total_synced": len(emails)
             }
-            with open(sync_path, 'w') as f:
-                json.dump(state, f)
+            jsonio.atomic_write_bytes(sync_path, jsonio.dumps(state))
+            # The snapshot now includes everything a legacy journal recorded
+            self._get_sync_journal_path().unlink(missing_ok=True)
             logger.info(f"Saved sync state: historyId={history_id}, {len(emails)} emails")
         except Exception as e:
             logger.error(f"Could not save sync state: {e}")
 
+    def _replay_sync_journal(self, journal_path: Path, state: Dict):
+        """Apply a legacy journal's email upserts, deletions and sync markers to state"""
+        emails = state.setdefault("emails", {})
+        try:
+            for record in jsonio.iter_jsonl(journal_path, skip_invalid=True):
+                if "email" in record:
+                    email = record["email"]
+                    emails[email["email_id"]] = email
+                elif "deleted" in record:
+                    emails.pop(record["deleted"], None)
+                elif "history_id" in record:
+                    state["history_id"] = record["history_id"]
+                    state["last_sync_time"] = record["last_sync_time"]
+        finally:
+            state["total_synced"] = len(emails)
+
     def get_current_history_id(self) -> Optional[str]:
         """Get the current historyId from Gmail profile"""
         try:
-            profile = self.service.users().getProfile(userId='me').execute()
+            profile = self.service.users().getProfile(userId='me', fields='historyId').execute()
             return profile.get('historyId')
         except HttpError as e:
-            from gmail_organizer.logger import logger
             logger.error(f"Could not get current historyId: {e}")
             return None
 
@@ -215,8 +439,15 @@ class GmailOperations:
         Returns:
             List of all email dictionaries (cached + new)
         """
-        from gmail_organizer.logger import logger
-        from datetime import datetime
+        return list(self.sync_email_map(query, progress_callback).values())
+
+    def sync_email_map(self, query: str = "", progress_callback=None) -> Dict[str, Dict]:
+        """
+        Smart sync like sync_emails, returning the email database keyed by ID.
+
+        Use this when the result is looked up by ID or iterated once; it
+        avoids copying every email reference into a new list.
+        """
 
         sync_state = self._load_sync_state()
         stored_history_id = sync_state.get("history_id")
@@ -228,7 +459,7 @@ class GmailOperations:
 
             # Try incremental sync
             try:
-                new_emails, deleted_ids, current_history_id = self._incremental_sync(
+                new_emails, deleted_ids, label_changes, current_history_id = self._incremental_sync(
                     stored_history_id,
                     progress_callback
                 )
@@ -240,17 +471,25 @@ class GmailOperations:
                     for email_id in deleted_ids:
                         cached_emails.pop(email_id, None)
 
-                    # Save updated state
+                    # Apply label changes to cached emails without re-fetching them
+                    relabeled = self._apply_label_changes(cached_emails, label_changes)
+
+                    # Save the full updated database rather than just this sync's
+                    # changes: the macOS helper reads the snapshot directly and
+                    # has no way to apply a delta journal
                     self._save_sync_state(current_history_id, cached_emails)
 
-                    logger.info(f"Incremental sync complete: +{len(new_emails)} new, -{len(deleted_ids)} deleted")
+                    logger.info(
+                        f"Incremental sync complete: +{len(new_emails)} new, -{len(deleted_ids)} deleted, "
+                        f"{len(relabeled)} relabeled"
+                    )
                     print(f"✓ Incremental sync: +{len(new_emails):,} new, -{len(deleted_ids):,} deleted")
                     print(f"✓ Total emails: {len(cached_emails):,}")
 
-                    return list(cached_emails.values())
+                    return cached_emails
 
             except HttpError as e:
-                if 'historyId' in str(e) or '404' in str(e):
+                if e.resp.status == 404 or 'historyId' in e.reason:
                     logger.warning(f"History expired, falling back to full sync: {e}")
                     print("⚠️  History expired, performing full sync...")
                 else:
@@ -264,16 +503,14 @@ class GmailOperations:
         current_history_id = self.get_current_history_id()
 
         # Perform full sync
-        emails = self.fetch_emails(
+        self._max_history_id = 0
+        emails_dict = self._fetch_email_map(
             max_results=1000000,  # Effectively unlimited
             query=query,
             progress_callback=progress_callback
         )
 
-        if emails:
-            # Convert to dict for efficient lookups
-            emails_dict = {e['email_id']: e for e in emails}
-
+        if emails_dict:
             # Merge with previously cached emails to prevent data loss
             # (handles case where current fetch got fewer emails than a previous sync)
             if cached_emails and len(cached_emails) > len(emails_dict):
@@ -285,16 +522,12 @@ class GmailOperations:
                 merged.update(emails_dict)  # New data takes priority
                 emails_dict = merged
 
-            # Get the historyId from the most recent message for accuracy
-            try:
-                msg = self.service.users().messages().get(
-                    userId='me',
-                    id=emails[0]['email_id'],
-                    format='minimal'
-                ).execute()
-                current_history_id = msg.get('historyId', current_history_id)
-            except Exception:
-                pass  # Use profile historyId as fallback
+            # Resume from the historyId captured before fetching: changes made
+            # during the fetch are replayed (harmlessly) by the next sync. The
+            # newest historyId in the responses can be past changes to emails
+            # fetched earlier, so it is only a fallback if the profile failed.
+            if not current_history_id and self._max_history_id:
+                current_history_id = str(self._max_history_id)
 
             # Save sync state for future incremental syncs
             self._save_sync_state(current_history_id, emails_dict)
@@ -302,9 +535,9 @@ class GmailOperations:
             print(f"✓ Full sync complete: {len(emails_dict):,} emails")
             print(f"✓ Saved sync state for future incremental syncs")
 
-            return list(emails_dict.values())
+            return emails_dict
 
-        return emails
+        return {}
 
     def _incremental_sync(self, start_history_id: str, progress_callback=None) -> tuple:
         """
@@ -317,9 +550,10 @@ class GmailOperations:
             progress_callback: Optional progress callback
 
         Returns:
-            Tuple of (new_emails, deleted_ids, current_history_id) or (None, None, None) on failure
+            Tuple of (new_emails, deleted_ids, label_changes, current_history_id), or
+            (None, None, None, None) on failure. label_changes maps message ID to
+            {'added': set, 'removed': set} label IDs for messages not newly fetched.
         """
-        from gmail_organizer.logger import logger
 
         logger.info(f"Starting incremental sync from historyId={start_history_id}")
 
@@ -328,21 +562,13 @@ class GmailOperations:
 
         new_message_ids = set()
         deleted_ids = set()
-        label_changes = {}  # message_id -> new labels
+        label_changes = {}  # message_id -> {'added': set, 'removed': set}
 
-        page_token = None
         history_count = 0
+        current_history_id = start_history_id
 
         try:
-            while True:
-                # Fetch history records
-                results = self.service.users().history().list(
-                    userId='me',
-                    startHistoryId=start_history_id,
-                    historyTypes=['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
-                    pageToken=page_token
-                ).execute()
-
+            for results in self._iter_history_pages(start_history_id):
                 history_records = results.get('history', [])
                 current_history_id = results.get('historyId', start_history_id)
 
@@ -359,27 +585,27 @@ class GmailOperations:
                         deleted_ids.add(msg_id)
                         new_message_ids.discard(msg_id)  # Don't fetch if deleted
 
-                    # Label changes (for existing messages)
+                    # Label changes (for existing messages), merged in history order
                     for msg in record.get('labelsAdded', []):
                         msg_id = msg['message']['id']
                         if msg_id not in new_message_ids:
-                            label_changes[msg_id] = msg['message'].get('labelIds', [])
+                            change = label_changes.setdefault(msg_id, {'added': set(), 'removed': set()})
+                            change['added'].update(msg.get('labelIds', []))
+                            change['removed'].difference_update(msg.get('labelIds', []))
 
                     for msg in record.get('labelsRemoved', []):
                         msg_id = msg['message']['id']
                         if msg_id not in new_message_ids:
-                            label_changes[msg_id] = msg['message'].get('labelIds', [])
-
-                page_token = results.get('nextPageToken')
-                if not page_token:
-                    break
+                            change = label_changes.setdefault(msg_id, {'added': set(), 'removed': set()})
+                            change['removed'].update(msg.get('labelIds', []))
+                            change['added'].difference_update(msg.get('labelIds', []))
 
             logger.info(f"History scan complete: {history_count} records, {len(new_message_ids)} new, {len(deleted_ids)} deleted")
 
-            if not new_message_ids and not deleted_ids:
+            if not new_message_ids and not deleted_ids and not label_changes:
                 logger.info("No changes since last sync")
                 print("✓ No new emails since last sync")
-                return [], [], current_history_id
+                return [], [], {}, current_history_id
 
             # Fetch details for new messages
             new_emails = []
@@ -390,13 +616,8 @@ class GmailOperations:
                 logger.info(f"Fetching {len(new_message_ids)} new email details...")
                 print(f"📥 Fetching {len(new_message_ids):,} new emails...")
 
-                # Use batch fetching for efficiency
-                message_ids_list = list(new_message_ids)
-                batch_size = 50
-
-                for batch_start in range(0, len(message_ids_list), batch_size):
-                    batch_ids = message_ids_list[batch_start:batch_start + batch_size]
-                    batch_emails, failed_ids = self._fetch_emails_batch(batch_ids)
+                # Use concurrent batch fetching for efficiency
+                for batch_emails in self._fetch_many(list(new_message_ids)):
                     new_emails.extend(batch_emails)
 
                     if progress_callback:
@@ -406,20 +627,75 @@ class GmailOperations:
                             f"Fetched {len(new_emails)}/{len(new_message_ids)} new emails"
                         )
 
-                    # Small delay between batches
-                    if batch_start + batch_size < len(message_ids_list):
-                        time.sleep(1)
+            # Fetched emails already carry their current labels
+            for msg_id in new_message_ids:
+                label_changes.pop(msg_id, None)
 
-            return new_emails, list(deleted_ids), current_history_id
+            return new_emails, list(deleted_ids), label_changes, current_history_id
 
         except HttpError as e:
-            error_str = str(e)
-            if '404' in error_str or 'notFound' in error_str:
+            if e.resp.status == 404:
                 logger.warning(f"History not found (too old?): {e}")
-                return None, None, None
+                return None, None, None, None
             raise
 
-    def fetch_emails(self, max_results=100, query="in:inbox", progress_callback=None) -> List[Dict]:
+    def _list_history_page(self, start_history_id: str, page_token: Optional[str]) -> Dict:
+        """Fetch one page of history records"""
+        return self.service.users().history().list(
+            userId='me',
+            startHistoryId=start_history_id,
+            historyTypes=['messageAdded', 'messageDeleted', 'labelAdded', 'labelRemoved'],
+            pageToken=page_token,
+            maxResults=self.HISTORY_PAGE_SIZE,
+            fields=self.HISTORY_FIELDS
+        ).execute(http=self._get_thread_http())
+
+    def _iter_history_pages(self, start_history_id: str) -> Iterator[Dict]:
+        """
+        Yield history.list pages, prefetching the next page in the background.
+
+        The request for page N+1 is in flight while the caller processes
+        page N, hiding one round trip per page without raising request rate.
+        """
+        with ThreadPoolExecutor(max_workers=1) as prefetcher:
+            results = self._list_history_page(start_history_id, None)
+            while True:
+                page_token = results.get('nextPageToken')
+                next_page = (
+                    prefetcher.submit(self._list_history_page, start_history_id, page_token)
+                    if page_token else None
+                )
+                yield results
+                if next_page is None:
+                    return
+                results = next_page.result()
+
+    def _apply_label_changes(self, emails: Dict[str, Dict], label_changes: Dict[str, Dict]) -> List[Dict]:
+        """
+        Apply incremental label additions/removals to cached emails in place.
+
+        Args:
+            emails: Cached emails keyed by ID
+            label_changes: Message ID -> {'added': set, 'removed': set} label IDs
+
+        Returns:
+            The emails whose label lists changed
+        """
+        changed = []
+        for msg_id, change in label_changes.items():
+            email = emails.get(msg_id)
+            if email is None:
+                continue
+            labels = email.get('labels', [])
+            new_labels = [label for label in labels if label not in change['removed']]
+            new_labels.extend(sorted(change['added'].difference(labels)))
+            if new_labels != labels:
+                email['labels'] = new_labels
+                changed.append(email)
+        return changed
+
+    def fetch_emails(self, max_results=100, query="in:inbox", progress_callback=None,
+                     need_body: Optional[bool] = None) -> List[Dict]:
         """
         Fetch emails from Gmail with pagination support
 
@@ -427,13 +703,22 @@ class GmailOperations:
             max_results: Maximum number of emails to fetch (no limit if set high)
             query: Gmail search query (e.g., "in:inbox", "is:unread")
             progress_callback: Optional callback function(current, total, message) for progress updates
+            need_body: Download full messages to fill body_preview; when False only
+                headers are fetched (format=metadata). Defaults to fetch_body_preview.
 
         Returns:
             List of email dictionaries
         """
-        from gmail_organizer.logger import logger
+        return list(self._fetch_email_map(max_results, query, progress_callback, need_body).values())
 
-        emails = []
+    def _fetch_email_map(self, max_results=100, query="in:inbox", progress_callback=None,
+                         need_body: Optional[bool] = None) -> Dict[str, Dict]:
+        """Fetch emails like fetch_emails, keyed by email ID in fetch order"""
+
+        if need_body is None:
+            need_body = self.fetch_body_preview
+
+        emails: Dict[str, Dict] = {}
         message_ids = []
         page_token = None
         fetched_count = 0
@@ -453,7 +738,8 @@ class GmailOperations:
                     userId='me',
                     maxResults=page_size,
                     q=query if query else None,
-                    pageToken=page_token
+                    pageToken=page_token,
+                    fields='messages/id,nextPageToken'
                 ).execute()
 
                 messages = results.get('messages', [])
@@ -478,22 +764,21 @@ class GmailOperations:
             if not message_ids:
                 logger.warning(f"No messages found for query: {query}")
                 print(f"No messages found for query: {query}")
-                return []
+                return {}
 
             total_to_fetch = len(message_ids)
 
             # Load checkpoint to resume from where we left off
             checkpoint_path = self._get_checkpoint_path(query)
             checkpoint = self._load_checkpoint(checkpoint_path)
-            fetched_ids = set(checkpoint.get("fetched_ids", []))
-            emails = checkpoint.get("emails", [])
+            emails = checkpoint.get("emails", {})
 
-            if fetched_ids:
+            if emails:
                 logger.info(f"📂 Loaded checkpoint: {len(emails)} emails already fetched")
                 print(f"📂 Resuming from checkpoint: {len(emails):,} emails already fetched")
 
             # Filter to only fetch emails we haven't fetched yet
-            message_ids = [msg_id for msg_id in message_ids if msg_id not in fetched_ids]
+            message_ids = [msg_id for msg_id in message_ids if msg_id not in emails]
             remaining_to_fetch = len(message_ids)
 
             if remaining_to_fetch == 0:
@@ -507,54 +792,20 @@ class GmailOperations:
             if progress_callback:
                 progress_callback(len(emails), total_to_fetch, f"Fetching {remaining_to_fetch:,} new emails...")
 
-            # Fetch email details using BATCH API for 100x speed improvement!
-            # Google recommends batches under 50 for reliability
-            # Gmail API limit: 15,000 quota units/min, messages.get = 5 units
-            # Max: 3,000 messages/min = 60 batches of 50/min = 1 batch every second
-            # Using 2s delay = 30 batches/min = 1,500 emails/min (safe margin)
-            batch_size = 50  # Google recommends < 50 for reliability
-            batch_delay = 2.0  # 30 batches/min, well within 60 batch/min limit
+            # Fetch email details using concurrent BATCH API requests (see _fetch_many)
             checkpoint_interval = 500  # Save checkpoint every N emails
+            last_checkpoint_count = len(emails)
 
-            for batch_start in range(0, len(message_ids), batch_size):
-                batch_end = min(batch_start + batch_size, len(message_ids))
-                batch_ids = message_ids[batch_start:batch_end]
-
-                # Fetch with retry logic - handles partial failures!
-                max_retries = 5
-                ids_to_fetch = batch_ids.copy()
-
-                for retry in range(max_retries):
-                    if not ids_to_fetch:
-                        break  # All succeeded
-
-                    # Fetch batch - returns (successful_emails, failed_ids) tuple
-                    batch_emails, failed_ids_batch = self._fetch_emails_batch(ids_to_fetch)
-
-                    # ALWAYS save successful emails immediately (even on partial failure)
-                    if batch_emails:
-                        emails.extend(batch_emails)
-                        for email in batch_emails:
-                            fetched_ids.add(email['email_id'])
-
-                    # Only retry the failed IDs, not the entire batch!
-                    if failed_ids_batch:
-                        ids_to_fetch = failed_ids_batch
-                        if retry < max_retries - 1:
-                            # Backoff: 10s, 30s, 60s, 60s (capped)
-                            wait_time = min(10.0 * (3 ** retry), 60.0)
-                            logger.warning(f"Rate limit hit for {len(failed_ids_batch)} emails in batch")
-                            logger.warning(f"Rate limit hit (retry {retry + 1}/{max_retries}), waiting {wait_time:.1f}s...")
-                            time.sleep(wait_time)
-                        else:
-                            logger.error(f"Max retries reached for batch {batch_start}-{batch_end}, skipping {len(ids_to_fetch)} emails")
-                    else:
-                        break  # All succeeded
+            for batch_emails in self._fetch_many(message_ids, need_body):
+                # Successful emails are kept even when part of the batch failed
+                for email in batch_emails:
+                    emails[email['email_id']] = email
 
                 # Save checkpoint periodically (not every batch - too expensive for large sets)
                 fetched_count = len(emails)
-                if fetched_count % checkpoint_interval < batch_size:
-                    self._save_checkpoint(checkpoint_path, emails, fetched_ids)
+                if fetched_count - last_checkpoint_count >= checkpoint_interval:
+                    self._save_checkpoint(checkpoint_path, emails)
+                    last_checkpoint_count = fetched_count
                     logger.info(f"  Checkpoint saved: {fetched_count}/{total_to_fetch} emails")
 
                 # Progress updates
@@ -565,11 +816,8 @@ class GmailOperations:
                 if progress_callback:
                     progress_callback(fetched_count, total_to_fetch, f"Fetched {fetched_count:,}/{total_to_fetch:,} emails")
 
-                # Rate limiting between batches
-                time.sleep(batch_delay)
-
             # Final checkpoint save
-            self._save_checkpoint(checkpoint_path, emails, fetched_ids)
+            self._save_checkpoint(checkpoint_path, emails)
 
             logger.info(f"Successfully fetched {len(emails)} total emails")
             print(f"✓ Fetch complete: {len(emails):,} total emails")
@@ -583,86 +831,211 @@ class GmailOperations:
 
         return emails
 
-    def _fetch_emails_batch(self, email_ids: List[str]) -> tuple:
+    def _fetch_many(self, message_ids: List[str], need_body: Optional[bool] = None) -> Iterator[List[Dict]]:
+        """
+        Fetch email details with concurrent batch requests.
+
+        Batches run on FETCH_WORKERS threads, paced by a shared token bucket
+        at MESSAGES_PER_MINUTE, with at most two batches per worker in flight.
+        Results are yielded on the calling thread as each batch completes, so
+        callers can checkpoint and report progress without locking.
+
+        Args:
+            message_ids: Email IDs to fetch
+            need_body: Fetch full messages for body_preview (defaults to fetch_body_preview)
+
+        Yields:
+            The successfully fetched emails of each completed batch
+        """
+        if need_body is None:
+            need_body = self.fetch_body_preview
+        batch_size = self.FULL_BATCH_SIZE if need_body else self.METADATA_BATCH_SIZE
+        workers = self.FETCH_WORKERS if self._get_thread_http() is not None else 1
+        rate_limiter = _TokenBucket(self.MESSAGES_PER_MINUTE, burst=batch_size * workers)
+        batches = [message_ids[i:i + batch_size] for i in range(0, len(message_ids), batch_size)]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending = set()
+            next_batch = 0
+            while next_batch < len(batches) or pending:
+                # Keep a bounded number of batches in flight
+                while next_batch < len(batches) and len(pending) < workers * 2:
+                    pending.add(executor.submit(
+                        self._fetch_batch_with_retry, batches[next_batch], rate_limiter, need_body
+                    ))
+                    next_batch += 1
+
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+    def _fetch_batch_with_retry(self, batch_ids: List[str], rate_limiter: "_TokenBucket",
+                                need_body: bool) -> List[Dict]:
+        """
+        Fetch one batch on a worker thread, retrying only the failed IDs
+
+        Args:
+            batch_ids: Email IDs in this batch
+            rate_limiter: Shared token bucket pacing batch requests
+            need_body: Fetch full messages for body_preview
+
+        Only rate-limited IDs are retried (with backoff); IDs that failed
+        for any other reason, e.g. a message deleted mid-sync, are skipped.
+
+        Returns:
+            Successfully fetched emails (IDs still failing after all retries are skipped)
+        """
+
+        max_retries = 5
+        emails = []
+        ids_to_fetch = list(batch_ids)
+        http = self._get_thread_http()
+
+        for retry in range(max_retries):
+            rate_limiter.acquire(len(ids_to_fetch))
+
+            batch_emails, rate_limited_ids, failed_ids = self._fetch_emails_batch(
+                ids_to_fetch, http=http, need_body=need_body
+            )
+            emails.extend(batch_emails)
+            if failed_ids:
+                logger.warning(f"Skipping {len(failed_ids)} emails that could not be fetched")
+
+            # Only retry the rate-limited IDs, not the entire batch!
+            if not rate_limited_ids:
+                rate_limiter.recover()
+                break
+            ids_to_fetch = rate_limited_ids
+            # Slow every worker down, not just this one
+            rate_limiter.backoff()
+            if retry < max_retries - 1:
+                # Backoff: 2s, 6s, 18s, 54s
+                wait_time = min(2.0 * (3 ** retry), 60.0)
+                logger.warning(f"Rate limit hit for {len(rate_limited_ids)} emails in batch")
+                logger.warning(f"Rate limit hit (retry {retry + 1}/{max_retries}), waiting {wait_time:.1f}s...")
+                time.sleep(wait_time)
+            else:
+                logger.error(f"Max retries reached for batch starting at {batch_ids[0]}, skipping {len(ids_to_fetch)} emails")
+
+        return emails
+
+    def _get_thread_http(self):
+        """
+        Get an authorized HTTP client owned by the calling thread.
+
+        httplib2 connections are not thread-safe, so concurrent batches each
+        need their own client. The creating thread reuses the service's
+        connection; every other thread builds one client on first use and
+        keeps it (and its keep-alive connection) for later batches. All
+        clients share the service's OAuth credentials. Returns None when the
+        service has no OAuth credentials to share, in which case batches
+        must run serially.
+        """
+        http = getattr(self._thread_local, 'http', None)
+        if http is None:
+            credentials = getattr(self._http, 'credentials', None)
+            if credentials is None:
+                return None
+            import google_auth_httplib2
+            from googleapiclient.http import build_http
+
+            # build_http applies the client library's default socket timeout
+            http = google_auth_httplib2.AuthorizedHttp(credentials, http=build_http())
+            self._thread_local.http = http
+        return http
+
+    def _fetch_emails_batch(self, email_ids: List[str], http=None, need_body: Optional[bool] = None) -> tuple:
         """
         Fetch multiple emails in a single batch request (100x faster!)
 
         Args:
             email_ids: List of email IDs to fetch (max 50 per batch recommended)
+            http: Optional HTTP client to execute the batch with (one per thread)
+            need_body: Fetch full messages for body_preview (defaults to fetch_body_preview)
 
         Returns:
-            Tuple of (successful_emails, failed_ids) - returns partial results!
+            Tuple of (successful_emails, rate_limited_ids, failed_ids) -
+            returns partial results! Rate-limited IDs are worth retrying;
+            failed IDs (not found, unparseable, other errors) are not.
         """
-        from gmail_organizer.logger import logger
 
+        if need_body is None:
+            need_body = self.fetch_body_preview
         emails = []
+        rate_limited_ids = []
         failed_ids = []
-        batch = self.service.new_batch_http_request()
+        history_ids = []
 
         # Map request_id to email_id for tracking failures
-        request_id_map = {}
-
-        def callback(request_id, response, exception):
+        request_id_map = {f"req_{i}": email_id for i, email_id in enumerate(email_ids)}
+
+        # Runs once per message: the lists, flags and helpers it touches are
+        # bound as defaults so each call reads fast locals, not closure cells
+        # or attributes of self
+        def callback(request_id, response, exception, _id_for=request_id_map.get,
+                     _add_email=emails.append, _add_failed=failed_ids.append,
+                     _add_rate_limited=rate_limited_ids.append, _add_history_id=history_ids.append,
+                     _parse_headers=self._parse_headers, _body_preview=self._get_body_preview,
+                     _need_body=need_body, _logger=logger):
             """Callback for each email in the batch"""
-            email_id = request_id_map.get(request_id)
+            email_id = _id_for(request_id)
 
             if exception is not None:
-                # Track failed IDs for retry
+                if isinstance(exception, HttpError) and _is_rate_limit_error(exception):
+                    # Retried by the caller; don't log (too noisy)
+                    if email_id:
+                        _add_rate_limited(email_id)
+                    return
                 if email_id:
-                    failed_ids.append(email_id)
-                if isinstance(exception, HttpError):
-                    error_str = str(exception)
-                    if 'rateLimitExceeded' in error_str or 'Quota exceeded' in error_str:
-                        return  # Don't log rate limit errors (too noisy)
-                logger.warning(f"Error fetching email {email_id}: {exception}")
+                    _add_failed(email_id)
+                _logger.warning(f"Error fetching email {email_id}: {exception}")
                 return
 
             try:
-                headers = response['payload'].get('headers', [])
-
-                subject = self._get_header(headers, 'Subject')
-                sender = self._get_header(headers, 'From')
-                to = self._get_header(headers, 'To')
-                date = self._get_header(headers, 'Date')
-                body_preview = self._get_body_preview(response['payload'])
-
-                emails.append({
-                    'email_id': response['id'],
-                    'subject': subject,
-                    'sender': sender,
-                    'to': to,
-                    'date': date,
-                    'snippet': response.get('snippet', ''),
-                    'body_preview': body_preview,
-                    'labels': response.get('labelIds', [])
-                })
+                payload = response['payload']
+                email = {'email_id': response['id'], **_parse_headers(payload.get('headers', []))}
+                email['snippet'] = response.get('snippet', '')
+                # Skip the MIME walk entirely unless previews were requested
+                email['body_preview'] = _body_preview(payload) if _need_body else ""
+                email['labels'] = response.get('labelIds', [])
+                _add_email(email)
+                _add_history_id(int(response.get('historyId') or 0))
             except Exception as e:
-                logger.warning(f"Error parsing email in batch: {e}")
+                _logger.warning(f"Error parsing email in batch: {e}")
                 if email_id:
-                    failed_ids.append(email_id)
-
-        # Add all emails to batch request with tracking
-        for i, email_id in enumerate(email_ids):
-            request_id = f"req_{i}"
-            request_id_map[request_id] = email_id
-            batch.add(
-                self.service.users().messages().get(
-                    userId='me',
-                    id=email_id,
-                    format='full'
-                ),
-                callback=callback,
-                request_id=request_id
-            )
+                    _add_failed(email_id)
+
+        # Only download full MIME trees when the body preview is needed
+        if need_body:
+            get_kwargs = {'format': 'full', 'fields': self.FULL_MESSAGE_FIELDS}
+        else:
+            get_kwargs = {'format': 'metadata', 'metadataHeaders': self.METADATA_HEADERS,
+                          'fields': self.METADATA_MESSAGE_FIELDS}
+
+        # Add all emails to batch request with tracking; every request
+        # uses the batch's default callback
+        batch = self.service.new_batch_http_request(callback=callback)
+        messages = self.service.users().messages()
+        for request_id, email_id in request_id_map.items():
+            batch.add(messages.get(userId='me', id=email_id, **get_kwargs), request_id=request_id)
 
         # Execute batch (fetches all emails in 1 HTTP request!)
-        batch.execute()
+        batch.execute(http=http)
 
-        # Return both successful emails AND failed IDs (partial results!)
-        if failed_ids:
-            logger.info(f"Batch: {len(emails)} succeeded, {len(failed_ids)} failed")
+        # Track the newest historyId once per batch rather than per message
+        batch_max = max(history_ids, default=0)
+        if batch_max > self._max_history_id:
+            with self._history_id_lock:
+                self._max_history_id = max(self._max_history_id, batch_max)
 
-        return emails, failed_ids
+        # Return successful emails AND failed IDs (partial results!)
+        if rate_limited_ids or failed_ids:
+            logger.info(
+                f"Batch: {len(emails)} succeeded, {len(rate_limited_ids)} rate limited, "
+                f"{len(failed_ids)} failed"
+            )
+
+        return emails, rate_limited_ids, failed_ids
 
     def _get_email_details(self, email_id: str) -> Optional[Dict]:
         """
@@ -671,19 +1044,21 @@ class GmailOperations:
         Args:
             email_id: Gmail message ID
         """
+
         try:
             message = self.service.users().messages().get(
                 userId='me',
                 id=email_id,
-                format='full'
+                format='full',
+                fields=self.FULL_MESSAGE_FIELDS
             ).execute()
 
-            headers = message['payload'].get('headers', [])
+            headers = self._header_map(message['payload'].get('headers', []))
 
-            subject = self._get_header(headers, 'Subject')
-            sender = self._get_header(headers, 'From')
-            to = self._get_header(headers, 'To')
-            date = self._get_header(headers, 'Date')
+            subject = headers.get('subject', '')
+            sender = headers.get('from', '')
+            to = headers.get('to', '')
+            date = headers.get('date', '')
             body_preview = self._get_body_preview(message['payload'])
 
             return {
@@ -698,50 +1073,100 @@ class GmailOperations:
             }
 
         except HttpError as error:
-            print(f"Error fetching email {email_id}: {error}")
+            logger.error("Error fetching email %s: %s", email_id, error)
             return None
 
+    def _parse_headers(self, headers: List[Dict]) -> Dict:
+        """Extract the HEADER_FIELDS email fields from headers in one pass (first occurrence wins)
+
+        RAW_HEADERS that are present are returned under a 'headers' dict.
+        """
+        fields = dict.fromkeys(self.HEADER_FIELDS.values(), "")
+        raw_headers = {}
+        found = set()
+        wanted = len(self.HEADER_FIELDS) + len(self.RAW_HEADERS)
+        for header in headers:
+            name = header['name'].lower()
+            if name in found:
+                continue
+            field = self.HEADER_FIELDS.get(name)
+            if field is not None:
+                fields[field] = header['value']
+            elif name in self.RAW_HEADERS:
+                raw_headers[self.RAW_HEADERS[name]] = header['value']
+            else:
+                continue
+            found.add(name)
+            if len(found) == wanted:
+                break
+        if raw_headers:
+            fields['headers'] = raw_headers
+        return fields
+
+    def _header_map(self, headers: List[Dict]) -> Dict[str, str]:
+        """Index headers by lowercased name in one pass (first occurrence wins)"""
+        header_map = {}
+        for header in headers:
+            header_map.setdefault(header['name'].lower(), header['value'])
+        return header_map
+
     def _get_header(self, headers: List[Dict], name: str) -> str:
         """Extract a specific header value"""
-        for header in headers:
-            if header['name'].lower() == name.lower():
-                return header['value']
-        return ""
+        return self._header_map(headers).get(name.lower(), "")
 
     def _get_body_preview(self, payload: Dict, max_length=2000) -> str:
         """Extract email body text content"""
-        body = ""
-
-        # Try to get plain text body (recursively check parts)
-        body = self._extract_text_from_payload(payload)
+        # Try to get plain text body (checking nested parts), decoding no
+        # more bytes than max_length characters can take in UTF-8
+        body = self._extract_text_from_payload(payload, max_bytes=max_length * 4)
 
         # Clean and truncate
         body = body.replace('\r', '').strip()
         return body[:max_length]
 
-    def _extract_text_from_payload(self, payload: Dict) -> str:
-        """Recursively extract text/plain content from email payload"""
-        # Direct body data
-        if payload.get('mimeType') == 'text/plain' and 'data' in payload.get('body', {}):
-            return base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
-
-        # Check parts recursively
-        if 'parts' in payload:
-            for part in payload['parts']:
-                if part.get('mimeType') == 'text/plain' and 'data' in part.get('body', {}):
-                    return base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
-                # Recurse into multipart
-                if 'parts' in part:
-                    result = self._extract_text_from_payload(part)
-                    if result:
-                        return result
+    def _extract_text_from_payload(self, payload: Dict, max_bytes: int = None) -> str:
+        """Extract the first text/plain part from an email payload
+
+        Parts are walked depth-first in document order with an explicit
+        stack, stopping at the first text/plain part; other parts are never
+        decoded.
+
+        Args:
+            payload: Message payload from the Gmail API
+            max_bytes: Decode at most this many bytes of the body
+        """
+        stack = [payload]
+        while stack:
+            part = stack.pop()
+            body = part.get('body') or {}
+            if part.get('mimeType') == 'text/plain' and 'data' in body:
+                return self._decode_body_data(body['data'], max_bytes)
+            parts = part.get('parts')
+            if parts:
+                stack.extend(reversed(parts))
 
         # Fallback: try body directly
-        if 'body' in payload and 'data' in payload.get('body', {}):
-            return base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
+        body = payload.get('body') or {}
+        if 'data' in body:
+            return self._decode_body_data(body['data'], max_bytes)
 
         return ""
 
+    def _decode_body_data(self, data: str, max_bytes: int = None) -> str:
+        """Decode base64url body data, optionally only its first max_bytes bytes
+
+        Only the prefix of the encoded data holding max_bytes bytes is
+        decoded, so a large body costs O(max_bytes) rather than O(body size).
+        A multi-byte character cut at the limit is dropped.
+        """
+        if max_bytes is not None:
+            # Every 4 base64 characters encode 3 bytes
+            data = data[:(max_bytes + 2) // 3 * 4]
+        raw = binascii.a2b_base64(data.translate(_BASE64URL_CHARS))
+        if max_bytes is not None:
+            raw = raw[:max_bytes]
+        return raw.decode('utf-8', errors='ignore')
+
     def get_or_create_label(self, label_name: str, color: str = None) -> str:
         """
         Get existing label ID or create new label
@@ -753,17 +1178,36 @@ class GmailOperations:
         Returns:
             Label ID
         """
-        # Refresh labels cache
+
+        # Load labels cache
         self._refresh_labels_cache()
 
         # Check if label exists
-        for label in self.labels_cache:
-            if label['name'] == label_name:
-                return label['id']
+        label_id = self._labels_by_name.get(label_name)
+        if label_id:
+            return label_id
 
         # Create new label
-        print(f"Creating label: {label_name}")
+        logger.info("Creating label: %s", label_name)
+
+        try:
+            result = self.service.users().labels().create(
+                userId='me',
+                body=self._build_label_object(label_name, color)
+            ).execute()
 
+            # Keep the cache current instead of re-listing labels
+            self._labels_by_name[label_name] = result['id']
+            self._save_labels_cache()
+
+            return result['id']
+
+        except HttpError as error:
+            logger.error("Error creating label '%s': %s", label_name, error)
+            return None
+
+    def _build_label_object(self, label_name: str, color: str = None) -> Dict:
+        """Build the labels().create request body for a label"""
         label_object = {
             'name': label_name,
             'labelListVisibility': 'labelShow',
@@ -772,62 +1216,123 @@ class GmailOperations:
 
         if color:
             # Gmail uses predefined color IDs, map hex to closest
-            label_object['color'] = self._get_gmail_color(color)
+            label_object['color'] = dict(self._get_gmail_color(color))
 
-        try:
-            result = self.service.users().labels().create(
-                userId='me',
-                body=label_object
-            ).execute()
+        return label_object
 
-            # Refresh cache
-            self.labels_cache = None
+    def _refresh_labels_cache(self):
+        """Load the label name -> ID cache
 
-            return result['id']
+        Uses the on-disk cache if it is younger than LABELS_CACHE_TTL_SECONDS,
+        otherwise one labels.list call (saved back to disk).
+        """
+
+        if self._labels_by_name is not None:
+            return
+
+        cache_path = self._get_labels_cache_path()
+        try:
+            if time.time() - cache_path.stat().st_mtime < self.LABELS_CACHE_TTL_SECONDS:
+                self._labels_by_name = jsonio.loads(cache_path.read_bytes())
+                return
+        except (OSError, ValueError):
+            pass
 
+        try:
+            results = self.service.users().labels().list(userId='me', fields='labels(id,name)').execute()
+            self._labels_by_name = {label['name']: label['id'] for label in results.get('labels', [])}
+            self._save_labels_cache()
         except HttpError as error:
-            print(f"Error creating label '{label_name}': {error}")
-            return None
+            logger.error("Error fetching labels: %s", error)
+            self._labels_by_name = {}
 
-    def _refresh_labels_cache(self):
-        """Refresh the labels cache"""
-        if self.labels_cache is None:
-            try:
-                results = self.service.users().labels().list(userId='me').execute()
-                self.labels_cache = results.get('labels', [])
-            except HttpError as error:
-                print(f"Error fetching labels: {error}")
-                self.labels_cache = []
+    def _save_labels_cache(self):
+        """Persist the label name -> ID cache so later runs skip labels.list"""
+
+        try:
+            jsonio.atomic_write_bytes(self._get_labels_cache_path(), jsonio.dumps(self._labels_by_name))
+        except OSError as e:
+            logger.warning(f"Could not save labels cache: {e}")
+
+    def _invalidate_labels_cache(self):
+        """Forget cached label IDs (e.g. after a label was deleted in Gmail)"""
+        self._labels_by_name = None
+        self._get_labels_cache_path().unlink(missing_ok=True)
 
-    def _get_gmail_color(self, hex_color: str) -> Dict:
+    def _get_gmail_color(self, hex_color: str) -> Mapping[str, str]:
         """
         Map hex color to Gmail's color system
         Gmail uses predefined background and text colors
-        """
-        # Simplified mapping - Gmail has specific color palette
-        color_map = {
-            "#fb4c2f": {"backgroundColor": "#fb4c2f", "textColor": "#ffffff"},  # Red
-            "#fad165": {"backgroundColor": "#fad165", "textColor": "#000000"},  # Yellow
-            "#16a766": {"backgroundColor": "#16a766", "textColor": "#ffffff"},  # Green
-            "#7bd148": {"backgroundColor": "#7bd148", "textColor": "#ffffff"},  # Bright green
-            "#b99aff": {"backgroundColor": "#b99aff", "textColor": "#000000"},  # Purple
-            "#ff7537": {"backgroundColor": "#ff7537", "textColor": "#ffffff"},  # Orange
-        }
 
-        return color_map.get(hex_color, {"backgroundColor": "#cccccc", "textColor": "#000000"})
+        Returns a shared read-only mapping; copy it before mutating.
+        """
+        return _GMAIL_LABEL_COLORS.get(hex_color, _DEFAULT_LABEL_COLOR)
 
     def apply_label_to_email(self, email_id: str, label_id: str):
         """Apply a label to an email"""
-        try:
-            self.service.users().messages().modify(
-                userId='me',
-                id=email_id,
-                body={'addLabelIds': [label_id]}
-            ).execute()
-            return True
-        except HttpError as error:
-            print(f"Error applying label to email {email_id}: {error}")
-            return False
+        return self.batch_apply_label([email_id], label_id) == 1
+
+    def batch_apply_label(self, email_ids: List[str], label_id: str, chunk_size: int = 1000) -> int:
+        """
+        Apply a label to many emails with messages.batchModify
+
+        Args:
+            email_ids: IDs of the emails to label
+            label_id: The label ID to apply
+            chunk_size: Emails per batchModify call (the API allows up to 1000)
+
+        Returns:
+            Number of emails labeled
+        """
+
+        applied = 0
+        for start in range(0, len(email_ids), chunk_size):
+            chunk = email_ids[start:start + chunk_size]
+            try:
+                self.service.users().messages().batchModify(
+                    userId='me',
+                    body={'ids': chunk, 'addLabelIds': [label_id]}
+                ).execute(http=self._get_thread_http())
+                applied += len(chunk)
+            except HttpError as error:
+                logger.error("Error applying label to %d emails: %s", len(chunk), error)
+                if error.resp.status in (400, 404):
+                    # The label may have been deleted since it was cached
+                    self._invalidate_labels_cache()
+
+        if applied:
+            # Label queries now match different emails
+            self.invalidate_count_cache()
+        return applied
+
+    def apply_labels_parallel(self, pairs: List[tuple]) -> int:
+        """
+        Apply a different label to each email
+
+        Emails are grouped by label so each label costs one batchModify call
+        per 1000 emails, and the labels are applied concurrently on
+        LABEL_WORKERS threads.
+
+        Args:
+            pairs: (email_id, label_id) tuples
+
+        Returns:
+            Number of emails labeled
+        """
+        ids_by_label = {}
+        for email_id, label_id in pairs:
+            ids_by_label.setdefault(label_id, []).append(email_id)
+
+        # Threads need their own connections (see _get_thread_http)
+        workers = min(self.LABEL_WORKERS, len(ids_by_label))
+        if workers <= 1 or self._get_thread_http() is None:
+            return sum(self.batch_apply_label(email_ids, label_id)
+                       for label_id, email_ids in ids_by_label.items())
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(self.batch_apply_label, email_ids, label_id)
+                       for label_id, email_ids in ids_by_label.items()]
+            return sum(future.result() for future in futures)
 
     def create_filter(self, category_key: str, label_id: str):
         """
@@ -837,10 +1342,11 @@ class GmailOperations:
             category_key: The category key (e.g., "applications")
             label_id: The label ID to apply
         """
+
         # This is a simplified version
         # In practice, you'd need to analyze patterns and create specific filters
-        print(f"Note: Automatic filter creation for '{category_key}' requires pattern analysis")
-        print(f"  You can manually create filters in Gmail settings for label: {label_id}")
+        logger.info("Note: Automatic filter creation for '%s' requires pattern analysis", category_key)
+        logger.info("  You can manually create filters in Gmail settings for label: %s", label_id)
 
     def create_all_labels(self) -> Dict[str, str]:
         """
@@ -849,37 +1355,78 @@ class GmailOperations:
         Returns:
             Dict mapping category_key to label_id
         """
+
         label_map = {}
+        # category_key -> (label_name, color) for labels still to create
+        missing = {}
 
-        print("\nCreating Gmail labels...")
+        logger.info("Creating Gmail labels...")
 
-        for group_name, group in CATEGORIES.items():
-            for category_key, category_info in group.items():
-                label_name = category_info['name']
-                color = category_info.get('color')
+        # One labels.list call, then only the labels that don't exist yet
+        self._refresh_labels_cache()
+        existing = self._labels_by_name
 
-                label_id = self.get_or_create_label(label_name, color)
-                if label_id:
-                    label_map[category_key] = label_id
-                    print(f"  ✓ {label_name}")
+        for category_key, label_name, color in _FLAT_CATEGORIES:
+            if label_name in existing:
+                label_map[category_key] = existing[label_name]
+                logger.info("  ✓ %s", label_name)
+            else:
+                missing[category_key] = (label_name, color)
+
+        def callback(request_id, response, exception):
+            label_name = missing[request_id][0]
+            if exception is not None:
+                logger.error("Error creating label '%s': %s", label_name, exception)
+                return
+            self._labels_by_name[label_name] = response['id']
+            label_map[request_id] = response['id']
+            logger.info("  ✓ %s", label_name)
+
+        # Create the missing labels with batch requests instead of one
+        # round trip per label
+        missing_keys = list(missing)
+        for start in range(0, len(missing_keys), self.LABEL_BATCH_SIZE):
+            batch = self.service.new_batch_http_request(callback=callback)
+            for category_key in missing_keys[start:start + self.LABEL_BATCH_SIZE]:
+                batch.add(
+                    self.service.users().labels().create(
+                        userId='me',
+                        body=self._build_label_object(*missing[category_key])
+                    ),
+                    request_id=category_key
+                )
+            try:
+                batch.execute()
+            except HttpError as error:
+                logger.error("Error creating labels: %s", error)
+
+        if missing:
+            self._save_labels_cache()
 
         return label_map
 
     def get_email_count(self, query="") -> int:
         """
         Get count of emails matching query.
-        For empty query (all mail), uses Gmail profile API for accurate total.
-        For specific queries, uses resultSizeEstimate (approximate).
+        For empty query (all mail), uses Gmail profile API for accurate total,
+        reusing it for PROFILE_TTL_SECONDS.
+        For specific queries, uses resultSizeEstimate (approximate), reusing
+        it for COUNT_TTL_SECONDS unless invalidate_count_cache is called.
         """
-        from gmail_organizer.logger import logger
 
         try:
             # For all mail (empty query), use profile API for accurate count
             if not query or query.strip() == "":
+                now = time.monotonic()
+                if self._profile_cache and now - self._profile_cache[0] < self.PROFILE_TTL_SECONDS:
+                    return self._profile_cache[1]
                 try:
-                    profile = self.service.users().getProfile(userId='me').execute()
+                    profile = self.service.users().getProfile(
+                        userId='me', fields='messagesTotal'
+                    ).execute()
                     total_messages = profile.get('messagesTotal', 0)
                     logger.info(f"Gmail profile API: Total messages = {total_messages}")
+                    self._profile_cache = (now, total_messages)
                     return total_messages
                 except HttpError as api_error:
                     logger.warning(f"Profile API failed (using estimate fallback): {api_error}")
@@ -889,15 +1436,21 @@ class GmailOperations:
                     # Fall through to use messages.list instead
 
             # For specific queries, use messages.list with resultSizeEstimate
+            now = time.monotonic()
+            cached = self._count_cache.get(query)
+            if cached and now - cached[0] < self.COUNT_TTL_SECONDS:
+                return cached[1]
             try:
                 results = self.service.users().messages().list(
                     userId='me',
                     q=query if query else None,
-                    maxResults=1
+                    maxResults=1,
+                    fields='resultSizeEstimate'
                 ).execute()
 
                 count = results.get('resultSizeEstimate', 0)
                 logger.debug(f"Gmail API resultSizeEstimate for query '{query}': {count}")
+                self._count_cache[query] = (now, count)
                 return count
 
             except HttpError as api_error:
@@ -909,6 +1462,19 @@ class GmailOperations:
             return 0
 
 
+    def invalidate_count_cache(self, query: str = None):
+        """
+        Drop cached get_email_count results
+
+        Args:
+            query: Query whose count to drop; all cached counts when omitted
+        """
+        if query is None:
+            self._count_cache.clear()
+        else:
+            self._count_cache.pop(query, None)
+
+
 if __name__ == "__main__":
     from gmail_organizer.auth import GmailAuthManager
 
@@ -3,11 +3,29 @@
 import re
 import json
 import os
+from bisect import bisect_left
 from collections import Counter, defaultdict
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional, Tuple
 from email.utils import parsedate_to_datetime
 
+from . import jsonio
+
+_ANGLE_ADDRESS_RE = re.compile(r'<(.+?)>')
+
+
+@lru_cache(maxsize=16384)
+def _extract_address(sender: str) -> str:
+    """Extract the lowercased address from a sender string (cached, as the
+    same senders recur across a mailbox)"""
+    match = _ANGLE_ADDRESS_RE.search(sender)
+    if match:
+        return match.group(1).lower()
+    if '@' in sender:
+        return sender.strip().lower()
+    return sender.lower()
+
 
 class PriorityScorer:
     """Score emails by importance using multiple signals"""
@@ -34,10 +52,21 @@ class PriorityScorer:
                 'digest', 'weekly', 'monthly', 'update', 'announcement']
     }
 
+    # One alternation per tier: a subject is scanned once per tier instead
+    # of once per keyword
+    _URGENCY_PATTERNS = {
+        tier: re.compile('|'.join(map(re.escape, keywords)))
+        for tier, keywords in URGENCY_KEYWORDS.items()
+    }
+
     def __init__(self, config_dir: str = ".sync-state"):
         self.config_dir = config_dir
         self._config = self._load_config()
+        self._update_sender_sets()
+        self._update_weights()
         self._sender_stats: Dict[str, Dict] = {}
+        # Weighted frequency + reply-rate score per sender, from _build_sender_stats
+        self._sender_signals: Dict[str, float] = {}
 
     def _load_config(self) -> Dict:
         """Load priority configuration"""
@@ -55,12 +84,24 @@ class PriorityScorer:
             'thresholds': {'high': 0.7, 'medium': 0.4}
         }
 
+    def _update_sender_sets(self):
+        """Rebuild the lowercased VIP and low-priority sender sets"""
+        self._vip_set = frozenset(s.lower() for s in self._config.get('vip_senders', []))
+        self._low_set = frozenset(s.lower() for s in self._config.get('low_priority_senders', []))
+
+    def _update_weights(self):
+        """Resolve the configured weights into a tuple ordered like
+        DEFAULT_WEIGHTS, so scoring reads locals instead of dict lookups"""
+        weights = self._config.get('weights', self.DEFAULT_WEIGHTS)
+        self._weights = tuple(
+            weights.get(name, default) for name, default in self.DEFAULT_WEIGHTS.items()
+        )
+
     def save_config(self):
         """Save priority configuration"""
         os.makedirs(self.config_dir, exist_ok=True)
         config_file = os.path.join(self.config_dir, "priority_config.json")
-        with open(config_file, 'w') as f:
-            json.dump(self._config, f, indent=2)
+        jsonio.atomic_write_bytes(config_file, json.dumps(self._config, indent=2).encode())
 
     @property
     def vip_senders(self) -> List[str]:
@@ -69,6 +110,7 @@ class PriorityScorer:
     @vip_senders.setter
     def vip_senders(self, senders: List[str]):
         self._config['vip_senders'] = senders
+        self._update_sender_sets()
         self.save_config()
 
     @property
@@ -78,6 +120,7 @@ class PriorityScorer:
     @low_priority_senders.setter
     def low_priority_senders(self, senders: List[str]):
         self._config['low_priority_senders'] = senders
+        self._update_sender_sets()
         self.save_config()
 
     @property
@@ -89,14 +132,20 @@ class PriorityScorer:
         self._config['thresholds'] = values
         self.save_config()
 
-    def _build_sender_stats(self, emails: List[Dict]):
-        """Pre-compute sender statistics for scoring"""
+    def _build_sender_stats(self, emails: List[Dict], senders: Optional[List[str]] = None):
+        """Pre-compute sender statistics for scoring
+
+        Args:
+            emails: List of email dicts
+            senders: Extracted sender address of each email, if already known
+        """
+        if senders is None:
+            senders = [self._extract_email(email.get('sender', '')) for email in emails]
         sender_counts = Counter()
         sender_replied = Counter()
         user_sent = set()
 
-        for email in emails:
-            sender = self._extract_email(email.get('sender', ''))
+        for email, sender in zip(emails, senders):
             labels = email.get('labels', [])
 
             if 'SENT' in labels:
@@ -119,6 +168,17 @@ class PriorityScorer:
                 'total_emails': count
             }
 
+        # The sender signals depend only on the sender, so score them once
+        # per distinct sender rather than once per email
+        freq_weight, reply_weight = self._weights[:2]
+        self._sender_signals = {}
+        for sender, stats in self._sender_stats.items():
+            freq = stats['frequency']
+            # Moderate frequency is better (not too many, not too few)
+            freq_score = 1.0 - abs(freq - 0.3) if freq > 0 else 0
+            # High reply rate = important sender
+            self._sender_signals[sender] = freq_weight * freq_score + reply_weight * stats['reply_rate']
+
     def score_emails(self, emails: List[Dict],
                      user_email: str = "") -> List[Tuple[Dict, float, str]]:
         """
@@ -131,24 +191,30 @@ class PriorityScorer:
         Returns:
             List of (email, score, priority_level) tuples sorted by score desc
         """
-        # Build sender stats first
-        self._build_sender_stats(emails)
+        # Extract each sender once, then build sender stats
+        senders = [self._extract_email(email.get('sender', '')) for email in emails]
+        self._build_sender_stats(emails, senders)
 
+        now = datetime.now()
         results = []
-        for email in emails:
-            score = self._score_email(email, user_email)
+        for email, sender in zip(emails, senders):
+            score = self._score_email(email, user_email, sender, now)
             level = self._get_priority_level(score)
             results.append((email, score, level))
 
         results.sort(key=lambda x: x[1], reverse=True)
         return results
 
-    def _score_email(self, email: Dict, user_email: str = "") -> float:
+    def _score_email(self, email: Dict, user_email: str = "",
+                     sender: Optional[str] = None,
+                     now: Optional[datetime] = None) -> float:
         """Score a single email (0-1)"""
-        weights = self._config.get('weights', self.DEFAULT_WEIGHTS)
+        (_, _, recency_weight, urgency_weight, direct_weight,
+         question_weight, thread_weight, vip_weight) = self._weights
         score = 0.0
 
-        sender = self._extract_email(email.get('sender', ''))
+        if sender is None:
+            sender = self._extract_email(email.get('sender', ''))
         subject = email.get('subject', '').lower()
         labels = email.get('labels', [])
 
@@ -157,43 +223,35 @@ class PriorityScorer:
             return 0.0
 
         # VIP/Low priority overrides
-        if sender in [s.lower() for s in self._config.get('vip_senders', [])]:
-            score += weights.get('vip_sender', 0.05)
-        if sender in [s.lower() for s in self._config.get('low_priority_senders', [])]:
+        if sender in self._vip_set:
+            score += vip_weight
+        if sender in self._low_set:
             return 0.1  # Force low priority
 
-        # Sender frequency signal
-        stats = self._sender_stats.get(sender, {})
-        freq = stats.get('frequency', 0)
-        # Moderate frequency is better (not too many, not too few)
-        freq_score = 1.0 - abs(freq - 0.3) if freq > 0 else 0
-        score += weights.get('sender_frequency', 0.15) * freq_score
-
-        # Reply rate signal (high reply rate = important sender)
-        reply_rate = stats.get('reply_rate', 0)
-        score += weights.get('sender_reply_rate', 0.20) * reply_rate
+        # Sender frequency and reply rate signals
+        score += self._sender_signals.get(sender, 0.0)
 
         # Recency signal
-        recency = self._recency_score(email.get('date', ''))
-        score += weights.get('recency', 0.10) * recency
+        recency = self._recency_score(email.get('date', ''), now)
+        score += recency_weight * recency
 
         # Subject urgency
         urgency = self._urgency_score(subject)
-        score += weights.get('subject_urgency', 0.20) * urgency
+        score += urgency_weight * urgency
 
         # Direct-to signal
         if user_email:
             to_field = email.get('to', '').lower()
             if user_email.lower() in to_field:
-                score += weights.get('is_direct', 0.15)
+                score += direct_weight
 
         # Question signal
         if '?' in subject:
-            score += weights.get('has_question', 0.10)
+            score += question_weight
 
         # Thread signal (presence of Re: or Fwd:)
         if subject.startswith('re:') or 'thread' in labels:
-            score += weights.get('thread_length', 0.05) * 0.5
+            score += thread_weight * 0.5
 
         return min(score, 1.0)
 
@@ -201,17 +259,14 @@ class PriorityScorer:
         """Score subject urgency (0-1)"""
         subject_lower = subject.lower()
 
-        for keyword in self.URGENCY_KEYWORDS['high']:
-            if keyword in subject_lower:
-                return 1.0
+        if self._URGENCY_PATTERNS['high'].search(subject_lower):
+            return 1.0
 
-        for keyword in self.URGENCY_KEYWORDS['medium']:
-            if keyword in subject_lower:
-                return 0.6
+        if self._URGENCY_PATTERNS['medium'].search(subject_lower):
+            return 0.6
 
-        for keyword in self.URGENCY_KEYWORDS['low']:
-            if keyword in subject_lower:
-                return 0.1
+        if self._URGENCY_PATTERNS['low'].search(subject_lower):
+            return 0.1
 
         return 0.3  # Neutral
 
@@ -224,29 +279,29 @@ class PriorityScorer:
         (14, 0.3),
         (30, 0.1),
     ]
+    # The tiers split for bisection; the extra score is for 30+ days
+    _RECENCY_MAX_DAYS = tuple(max_days for max_days, _ in _RECENCY_TIERS)
+    _RECENCY_SCORES = tuple(score for _, score in _RECENCY_TIERS) + (0.0,)
+
+    def _recency_score(self, date_str: str, now: Optional[datetime] = None) -> float:
+        """Score recency (1.0 = today, 0.0 = 30+ days ago)
 
-    def _recency_score(self, date_str: str) -> float:
-        """Score recency (1.0 = today, 0.0 = 30+ days ago)"""
+        Args:
+            date_str: RFC 2822 date header
+            now: Reference time (defaults to the current time)
+        """
         if not date_str:
             return 0.0
         try:
             dt = parsedate_to_datetime(date_str).replace(tzinfo=None)
-            days_ago = (datetime.now() - dt).days
-            for max_days, score in self._RECENCY_TIERS:
-                if days_ago <= max_days:
-                    return score
-            return 0.0
+            days_ago = ((now or datetime.now()) - dt).days
+            return self._RECENCY_SCORES[bisect_left(self._RECENCY_MAX_DAYS, days_ago)]
         except Exception:
             return 0.0
 
     def _extract_email(self, sender: str) -> str:
         """Extract email from sender string"""
-        match = re.search(r'<(.+?)>', sender)
-        if match:
-            return match.group(1).lower()
-        if '@' in sender:
-            return sender.strip().lower()
-        return sender.lower()
+        return _extract_address(sender)
 
     def _get_priority_level(self, score: float) -> str:
         """Convert score to priority level"""
@@ -3,7 +3,9 @@
 import re
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
 
 
 @dataclass
@@ -62,14 +64,61 @@ URGENCY_KEYWORDS = [
     re.compile(r"\boverdue\b", re.IGNORECASE),
 ]
 
+# Each pattern list fused into one alternation, so a text is scanned once
+# per list instead of once per pattern. Every action-item pattern gets its
+# own named group so matches can still be counted per distinct pattern.
+QUESTION_RE = re.compile("|".join(p.pattern for p in QUESTION_PATTERNS), re.IGNORECASE)
+ACTION_ITEM_RE = re.compile(
+    "|".join(f"(?P<p{i}>{p.pattern})" for i, p in enumerate(ACTION_ITEM_PATTERNS)),
+    re.IGNORECASE,
+)
+URGENCY_RE = re.compile("|".join(p.pattern for p in URGENCY_KEYWORDS), re.IGNORECASE)
+
+# Deadline phrases that select the "complete before the deadline" suggestion
+DEADLINE_RE = re.compile(
+    r"deadline|by (?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)"
+)
+
+_ANGLE_ADDRESS_RE = re.compile(r"<([^>]+)>")
+
+
+@lru_cache(maxsize=16384)
+def _sender_address(from_field: str) -> str:
+    """Extract the lowercased address from a From value (cached, as the
+    same senders recur across a mailbox)."""
+    # Handle "Name <email@example.com>" format
+    match = _ANGLE_ADDRESS_RE.search(from_field)
+    if match:
+        return match.group(1).lower()
+    return from_field.strip().lower()
+
+
+@lru_cache(maxsize=32768)
+def _parse_date_string(date_value: str) -> Optional[datetime]:
+    """Parse an ISO 8601 or RFC 2822 date string, or return None.
+
+    The format is picked from the string's shape ("YYYY-..." is ISO) so
+    each value goes to exactly one parser. Naive results are taken as UTC.
+    """
+    try:
+        if date_value[4:5] == "-":
+            parsed = datetime.fromisoformat(date_value)
+        else:
+            parsed = parsedate_to_datetime(date_value)
+    except (ValueError, TypeError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
 
 class FollowUpDetector:
     """Detects emails that may need follow-up responses."""
 
     def __init__(self):
-        self.question_patterns = QUESTION_PATTERNS
-        self.action_item_patterns = ACTION_ITEM_PATTERNS
-        self.urgency_keywords = URGENCY_KEYWORDS
+        self.question_pattern = QUESTION_RE
+        self.action_item_pattern = ACTION_ITEM_RE
+        self.urgency_pattern = URGENCY_RE
 
     def detect_follow_ups(
         self, emails: List[Dict], user_email: str = ""
@@ -94,11 +143,20 @@ class FollowUpDetector:
         """
         follow_ups: List[FollowUpItem] = []
 
+        # Extract each email's sender and date once for both passes
+        annotated = [
+            (email, self._get_sender(email), self._parse_date(email)) for email in emails
+        ]
+
         # Build a set of thread IDs that have replies (for awaiting_reply detection)
-        threads_with_replies = self._build_thread_reply_map(emails, user_email)
+        threads_with_replies = self._build_thread_reply_map(annotated, user_email)
 
-        for email in emails:
-            item = self._check_email(email, user_email, threads_with_replies)
+        now = datetime.now(timezone.utc)
+        for email, sender, email_date in annotated:
+            days_waiting = max(0, (now - email_date).days)
+            item = self._check_email(
+                email, user_email, threads_with_replies, sender, days_waiting
+            )
             if item is not None:
                 follow_ups.append(item)
 
@@ -153,14 +211,21 @@ class FollowUpDetector:
         email: Dict,
         user_email: str,
         threads_with_replies: Dict[str, bool],
+        sender: Optional[str] = None,
+        days_waiting: Optional[int] = None,
     ) -> Optional[FollowUpItem]:
         """Check a single email for follow-up needs.
 
+        The sender and days waiting are derived from the email unless the
+        caller already has them.
+
         Returns a FollowUpItem if follow-up is needed, None otherwise.
         Priority: awaiting_reply > action_item > question.
         """
-        days_waiting = self._calculate_days_waiting(email)
-        sender = self._get_sender(email)
+        if days_waiting is None:
+            days_waiting = self._calculate_days_waiting(email)
+        if sender is None:
+            sender = self._get_sender(email)
         is_sent_by_user = self._is_from_user(sender, user_email)
 
         # Check for awaiting reply (sent by user, no reply in thread)
@@ -186,7 +251,7 @@ class FollowUpDetector:
 
         # Check for action items (higher priority than questions)
         if self._has_action_items(combined_text):
-            urgency = self._determine_urgency(email, days_waiting)
+            urgency = self._determine_urgency(email, days_waiting, combined_text)
             return FollowUpItem(
                 email=email,
                 reason="action_item",
@@ -197,7 +262,7 @@ class FollowUpDetector:
 
         # Check for unanswered questions
         if self._has_questions(subject, body):
-            urgency = self._determine_urgency(email, days_waiting)
+            urgency = self._determine_urgency(email, days_waiting, combined_text)
             return FollowUpItem(
                 email=email,
                 reason="question",
@@ -209,45 +274,40 @@ class FollowUpDetector:
         return None
 
     def _build_thread_reply_map(
-        self, emails: List[Dict], user_email: str
+        self, annotated: List[Tuple[Dict, str, datetime]], user_email: str
     ) -> Dict[str, bool]:
         """Build a map of threadId -> whether there's a reply from someone else.
 
         For detecting 'awaiting reply': if the user sent a message and
         no one else replied in the same thread, it's awaiting reply.
+
+        Args:
+            annotated: (email, sender, parsed date) for each email.
+            user_email: The user's own email address.
         """
-        # Group emails by threadId
-        threads: Dict[str, List[Dict]] = {}
-        for email in emails:
+        # Per thread, the (date, position) of the earliest message from the
+        # user and of the latest message from anyone else. Position breaks
+        # date ties in list order, matching a stable sort by date.
+        threads: Dict[str, List[Optional[Tuple[datetime, int]]]] = {}
+        for position, (email, sender, email_date) in enumerate(annotated):
             thread_id = email.get("threadId", "")
-            if thread_id:
-                if thread_id not in threads:
-                    threads[thread_id] = []
-                threads[thread_id].append(email)
-
-        # For each thread, check if there's a non-user message after a user message
-        reply_map: Dict[str, bool] = {}
-        for thread_id, thread_emails in threads.items():
-            has_user_sent = False
-            has_reply = False
-
-            # Sort by date within thread
-            sorted_thread = sorted(
-                thread_emails, key=lambda e: self._parse_date(e)
-            )
-
-            for email in sorted_thread:
-                sender = self._get_sender(email)
-                if self._is_from_user(sender, user_email):
-                    has_user_sent = True
-                elif has_user_sent:
-                    # Someone else replied after user sent
-                    has_reply = True
-                    break
-
-            reply_map[thread_id] = has_reply
-
-        return reply_map
+            if not thread_id:
+                continue
+            bounds = threads.setdefault(thread_id, [None, None])
+            key = (email_date, position)
+            if self._is_from_user(sender, user_email):
+                if bounds[0] is None or key < bounds[0]:
+                    bounds[0] = key
+            elif bounds[1] is None or key > bounds[1]:
+                bounds[1] = key
+
+        # Someone else replied if their latest message comes after the
+        # user's first one
+        return {
+            thread_id: earliest_user is not None and latest_other is not None
+            and latest_other > earliest_user
+            for thread_id, (earliest_user, latest_other) in threads.items()
+        }
 
     def _has_questions(self, subject: str, body: str) -> bool:
         """Check if the email contains questions directed at the recipient."""
@@ -256,24 +316,21 @@ class FollowUpDetector:
             return True
 
         # Check body for question patterns
-        for pattern in self.question_patterns:
-            if pattern.search(body):
-                return True
-
-        return False
+        return self.question_pattern.search(body) is not None
 
     def _has_action_items(self, text: str) -> bool:
         """Check if the email contains action item indicators."""
-        match_count = 0
-        for pattern in self.action_item_patterns:
-            if pattern.search(text):
-                match_count += 1
-                # Require at least 2 pattern matches to reduce false positives
-                if match_count >= 2:
-                    return True
+        matched = set()
+        for match in self.action_item_pattern.finditer(text):
+            matched.add(match.lastgroup)
+            # Require at least 2 different patterns to reduce false positives
+            if len(matched) >= 2:
+                return True
         return False
 
-    def _determine_urgency(self, email: Dict, days_waiting: int) -> str:
+    def _determine_urgency(
+        self, email: Dict, days_waiting: int, combined_text: Optional[str] = None
+    ) -> str:
         """Determine urgency level based on age and keywords.
 
         Rules:
@@ -282,19 +339,21 @@ class FollowUpDetector:
             - later: less than 3 days waiting
 
         Urgent keywords can bump the urgency level up by one tier.
+        combined_text is the email's "subject body" text, built here if the
+        caller has not already built it.
         """
-        subject = email.get("subject", "") or ""
-        body = email.get("body") or email.get("snippet") or ""
-        combined_text = f"{subject} {body}"
-
-        has_urgent_keywords = any(
-            p.search(combined_text) for p in self.urgency_keywords
-        )
-
-        # Base urgency from days waiting
+        # Base urgency from days waiting; keywords cannot raise it further
         if days_waiting >= 7:
             return "overdue"
-        elif days_waiting >= 3:
+
+        if combined_text is None:
+            subject = email.get("subject", "") or ""
+            body = email.get("body") or email.get("snippet") or ""
+            combined_text = f"{subject} {body}"
+
+        has_urgent_keywords = self.urgency_pattern.search(combined_text) is not None
+
+        if days_waiting >= 3:
             # Urgent keywords bump from soon to overdue
             if has_urgent_keywords:
                 return "overdue"
@@ -330,34 +389,16 @@ class FollowUpDetector:
                     int(date_value) / 1000, tz=timezone.utc
                 )
 
-            # Try ISO format
-            for fmt in [
-                "%Y-%m-%dT%H:%M:%S.%fZ",
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%dT%H:%M:%S%z",
-                "%Y-%m-%dT%H:%M:%S.%f%z",
-                "%a, %d %b %Y %H:%M:%S %z",
-                "%d %b %Y %H:%M:%S %z",
-            ]:
-                try:
-                    parsed = datetime.strptime(date_value, fmt)
-                    if parsed.tzinfo is None:
-                        parsed = parsed.replace(tzinfo=timezone.utc)
-                    return parsed
-                except ValueError:
-                    continue
+            parsed = _parse_date_string(date_value)
+            if parsed is not None:
+                return parsed
 
         # Fallback to now if parsing fails
         return datetime.now(timezone.utc)
 
     def _get_sender(self, email: Dict) -> str:
         """Extract the sender email address from the email dict."""
-        from_field = email.get("sender", email.get("from", ""))
-        # Handle "Name <email@example.com>" format
-        match = re.search(r"<([^>]+)>", from_field)
-        if match:
-            return match.group(1).lower()
-        return from_field.strip().lower()
+        return _sender_address(email.get("sender", email.get("from", "")))
 
     def _is_from_user(self, sender: str, user_email: str) -> bool:
         """Check if the sender matches the user's email."""
@@ -369,11 +410,7 @@ class FollowUpDetector:
         """Generate a suggested action based on the action item content."""
         text_lower = text.lower()
 
-        if any(
-            kw in text_lower for kw in ["deadline", "by monday", "by tuesday",
-                                         "by wednesday", "by thursday",
-                                         "by friday", "by saturday", "by sunday"]
-        ):
+        if DEADLINE_RE.search(text_lower):
             return "Complete the requested task before the mentioned deadline."
 
         if "urgent" in text_lower or "asap" in text_lower:
@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Callable, Dict, List, Optional
 
+from . import jsonio
+
 
 @dataclass
 class ScheduleConfig:
@@ -237,8 +239,7 @@ class SyncScheduler:
             }
 
         try:
-            with open(config_path, "w") as f:
-                json.dump(data, f, indent=2)
+            jsonio.atomic_write_bytes(config_path, json.dumps(data, indent=2).encode())
         except Exception:
             pass
 
@@ -263,8 +263,8 @@ class SearchIndex:
         weight = int(self._field_weights['sender'])
         terms.extend(sender_terms * weight)
 
-        # Body preview
-        body = email.get('body_preview', '')
+        # Body preview (snippet when bodies were not fetched)
+        body = email.get('body_preview') or email.get('snippet', '')
         body_terms = self._tokenize_text(body)
         terms.extend(body_terms)
 
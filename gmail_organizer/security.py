@@ -91,7 +91,7 @@ class EmailSecurityScanner:
 
         sender = email.get('sender', '')
         subject = email.get('subject', '').lower()
-        body = email.get('body_preview', '').lower()
+        body = (email.get('body_preview') or email.get('snippet', '')).lower()
         headers = email.get('headers', {})
         full_text = f"{subject} {body}"
 
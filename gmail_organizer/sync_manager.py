@@ -1,10 +1,8 @@
 """Thread-safe sync manager for parallel multi-account Gmail syncing"""
 
 import threading
-import json
 from dataclasses import dataclass, field
 from datetime import datetime
-from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 
@@ -27,8 +25,6 @@ class SyncManager:
         self._statuses: Dict[str, SyncStatus] = {}
         self._lock = threading.Lock()
         self._services: Dict[str, Tuple] = {}  # name -> (service, email)
-        self._sync_state_dir = Path(__file__).parent.parent / ".sync-state"
-        self._sync_state_dir.mkdir(exist_ok=True)
 
     def register_account(self, name: str, service, email: str):
         """Register an account for syncing"""
@@ -37,20 +33,13 @@ class SyncManager:
             if name not in self._statuses:
                 self._statuses[name] = SyncStatus()
                 # Try to load existing data from disk
-                emails = self._load_from_disk(email)
+                state = self._load_state_from_disk(email)
+                emails = list(state.get("emails", {}).values())
                 if emails:
                     self._statuses[name].emails_data = emails
                     self._statuses[name].state = "complete"
                     self._statuses[name].message = f"{len(emails):,} emails loaded from disk"
-                    # Load last sync time from sync state file
-                    sync_path = self._get_sync_state_path(email)
-                    if sync_path.exists():
-                        try:
-                            with open(sync_path, 'r') as f:
-                                state = json.load(f)
-                                self._statuses[name].last_sync_time = state.get("last_sync_time", "")
-                        except Exception:
-                            pass
+                    self._statuses[name].last_sync_time = state.get("last_sync_time") or ""
 
     def start_sync(self, account_name: str, query: str = ""):
         """Launch a background sync thread for one account"""
@@ -98,11 +87,16 @@ class SyncManager:
             return any(s.state == "syncing" for s in self._statuses.values())
 
     def get_emails(self, account_name: str) -> List[Dict]:
-        """Get emails for an account from memory or disk fallback"""
+        """Get emails for an account from memory or disk fallback.
+
+        The returned list is shared, not copied: callers must not modify it
+        in place. Syncs replace the list rather than mutating it, so a
+        reference stays valid while a sync runs.
+        """
         with self._lock:
             status = self._statuses.get(account_name)
             if status and status.emails_data:
-                return list(status.emails_data)
+                return status.emails_data
 
         # Fallback: load from disk
         if account_name in self._services:
@@ -150,81 +144,18 @@ class SyncManager:
                     status.error = str(e)
                     status.message = f"Error: {e}"
 
-    def _get_sync_state_path(self, email: str) -> Path:
-        """Get sync state file path for an account email"""
-        safe_email = email.replace('@', '_at_').replace('.', '_')
-        return self._sync_state_dir / f"sync_state_{safe_email}.json"
-
-    def _load_from_disk(self, email: str) -> List[Dict]:
-        """Load emails from .sync-state/ files on disk.
+    def _load_state_from_disk(self, email: str) -> Dict:
+        """Load the sync state for an account from .sync-state/ files on disk.
 
         Also checks the checkpoint directory - if it has more emails
         (e.g., from an interrupted sync), merges them into the result.
         """
-        from gmail_organizer.logger import logger
-
-        emails_dict = {}
-        sync_path = self._get_sync_state_path(email)
-        state = {}
-
-        if sync_path.exists():
-            try:
-                with open(sync_path, 'r') as f:
-                    state = json.load(f)
-                    emails_dict = state.get("emails", {})
-            except Exception:
-                pass
-
-        # Check checkpoint for more data (handles interrupted syncs)
-        safe_email = email.replace('@', '_at_').replace('.', '_')
-        checkpoint_dir = Path(__file__).parent.parent / ".email-cache" / f"{safe_email}_all"
-        index_file = checkpoint_dir / "index.json"
-
-        if index_file.exists():
-            try:
-                with open(index_file, 'r') as f:
-                    checkpoint_count = len(json.load(f))
-
-                if checkpoint_count > len(emails_dict):
-                    logger.info(
-                        f"Checkpoint has {checkpoint_count} emails vs sync state "
-                        f"{len(emails_dict)} for {email}, recovering..."
-                    )
-                    # Load checkpoint batch files
-                    batch_files = sorted(checkpoint_dir.glob("batch_*.jsonl"))
-                    checkpoint_emails = []
-                    for batch_file in batch_files:
-                        with open(batch_file, 'r') as f:
-                            for line in f:
-                                try:
-                                    checkpoint_emails.append(json.loads(line))
-                                except Exception:
-                                    continue
-
-                    # Merge: sync state + checkpoint data
-                    merged = dict(emails_dict)
-                    for em in checkpoint_emails:
-                        email_id = em.get("email_id", "")
-                        if email_id:
-                            merged[email_id] = em
-                    emails_dict = merged
-
-                    # Save merged state to avoid re-merging next time
-                    try:
-                        save_state = {
-                            "history_id": state.get("history_id") or "",
-                            "last_sync_time": state.get("last_sync_time") or datetime.now().isoformat(),
-                            "emails": emails_dict,
-                            "total_synced": len(emails_dict)
-                        }
-                        with open(sync_path, 'w') as f:
-                            json.dump(save_state, f)
-                        logger.info(f"Saved merged sync state: {len(emails_dict)} emails for {email}")
-                    except Exception as e:
-                        logger.warning(f"Could not save merged state: {e}")
-            except Exception:
-                pass
-
-        if emails_dict:
-            return list(emails_dict.values())
-        return []
+        from gmail_organizer.operations import GmailOperations
+
+        # The on-disk format (snapshot, journal, checkpoint recovery) is
+        # owned by GmailOperations; no API calls are made here.
+        return GmailOperations(None, email)._load_sync_state()
+
+    def _load_from_disk(self, email: str) -> List[Dict]:
+        """Load emails from .sync-state/ files on disk"""
+        return list(self._load_state_from_disk(email).get("emails", {}).values())
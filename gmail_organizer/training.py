@@ -7,6 +7,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
+from . import jsonio
+
 
 @dataclass
 class TrainingExample:
@@ -389,8 +391,7 @@ class CategoryTrainer:
             })
 
         try:
-            with open(filepath, "w") as f:
-                json.dump(data, f, indent=2)
+            jsonio.atomic_write_bytes(filepath, json.dumps(data, indent=2).encode())
         except Exception:
             pass
 
@@ -11,6 +11,8 @@ from urllib.parse import urlparse
 
 from googleapiclient.errors import HttpError
 
+from . import jsonio
+
 
 class Subscription:
     """Represents a detected email subscription"""
@@ -111,8 +113,7 @@ class UnsubscribeManager:
         """Save unsubscribe state to disk"""
         os.makedirs(self.state_dir, exist_ok=True)
         state_file = os.path.join(self.state_dir, "unsubscribe_state.json")
-        with open(state_file, 'w') as f:
-            json.dump(self._unsubscribe_state, f, indent=2)
+        jsonio.atomic_write_bytes(state_file, json.dumps(self._unsubscribe_state, indent=2).encode())
 
     def detect_subscriptions(self, emails: List[Dict]) -> List[Subscription]:
         """